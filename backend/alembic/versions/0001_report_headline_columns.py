@@ -0,0 +1,120 @@
+"""Add headline result columns to analysis_reports
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+recommendation, confidence, predicted_return and target_price are copied
+out of the results JSON so reports can be filtered and grouped in SQL,
+and the index behind keyset pagination of a user's reports is added.
+Databases created by Base.metadata.create_all after the columns were added
+already have them, so only missing columns and indexes are created, then
+existing rows are backfilled from their results.
+"""
+import math
+from typing import Any, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "analysis_reports"
+INDEXES = {
+    "ix_analysis_reports_user_active_created": [
+        "user_id", "is_active", sa.text("created_at DESC"), sa.text("id DESC")
+    ],
+    "ix_analysis_reports_user_recommendation": ["user_id", "recommendation"],
+}
+COLUMNS = (
+    sa.Column("recommendation", sa.String(20), nullable=True),
+    sa.Column("confidence", sa.Float(), nullable=True),
+    sa.Column("predicted_return", sa.Float(), nullable=True),
+    sa.Column("target_price", sa.Float(), nullable=True),
+)
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Finite float from a results value, or None for anything non-numeric."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _to_recommendation(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and len(value) <= 20 else None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE):
+        # A fresh database gets the current schema from create_all
+        return
+
+    existing = {column["name"] for column in inspector.get_columns(TABLE)}
+    missing = [column for column in COLUMNS if column.name not in existing]
+    if missing:
+        with op.batch_alter_table(TABLE) as batch_op:
+            for column in missing:
+                batch_op.add_column(column.copy())
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes(TABLE)}
+    for name, columns in INDEXES.items():
+        if name not in existing_indexes:
+            op.create_index(name, TABLE, columns)
+
+    # Backfilled in Python so malformed values become NULL instead of
+    # failing a SQL cast
+    reports = sa.table(
+        TABLE,
+        sa.column("id"),
+        sa.column("results", sa.JSON),
+        *(sa.column(column.name, column.type) for column in COLUMNS)
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(reports.c.id, reports.c.results).where(reports.c.recommendation.is_(None))
+    ).all()
+
+    update = (
+        sa.update(reports)
+        .where(reports.c.id == sa.bindparam("report_id"))
+        .values(
+            recommendation=sa.bindparam("recommendation"),
+            confidence=sa.bindparam("confidence"),
+            predicted_return=sa.bindparam("predicted_return"),
+            target_price=sa.bindparam("target_price"),
+        )
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        params = [
+            {
+                "report_id": report_id,
+                "recommendation": _to_recommendation(results.get("recommendation")),
+                "confidence": _to_float(results.get("confidence")),
+                "predicted_return": _to_float(results.get("predicted_return")),
+                "target_price": _to_float(results.get("target_price")),
+            }
+            for report_id, results in rows[start:start + BACKFILL_BATCH_SIZE]
+            if isinstance(results, dict)
+        ]
+        if params:
+            bind.execute(update, params)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name=TABLE)
+    with op.batch_alter_table(TABLE) as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
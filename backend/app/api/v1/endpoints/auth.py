@@ -84,7 +84,7 @@ async def get_current_user(
     """
     Get current user from token
     """
-    user_id = security.verify_token(token)
+    user_id = await security.verify_token_async(token)
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -93,7 +93,7 @@ async def get_current_user(
         )
     
     user_service = UserService(db)
-    user = await user_service.get(id=user_id)
+    user = await user_service.get_cached(id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,12 +1,14 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
+import uuid
 
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
-from app.models.analysis import RiskLevel
+from app.models.analysis import AnalysisReport, RiskLevel
 from app.schemas.analysis import (
     ReportListResponse,
     AnalysisReportResponse,
@@ -21,9 +23,65 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _encode_cursor(cursor: Optional[Tuple[datetime, uuid.UUID]]) -> Optional[str]:
+    """Serialize a (created_at, id) keyset cursor for the client."""
+    if cursor is None:
+        return None
+    created_at, report_id = cursor
+    return f"{created_at.isoformat()}|{report_id}"
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, uuid.UUID]]:
+    """Parse a keyset cursor produced by _encode_cursor."""
+    if not cursor:
+        return None
+    try:
+        created_at, report_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(report_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _days_since(created_at: Optional[datetime]) -> int:
+    """
+    Whole days since created_at, which may be naive UTC (SQLite) or aware.
+    A report just inserted has no server-generated created_at loaded yet.
+    """
+    if created_at is None:
+        return 0
+    now = datetime.now(timezone.utc)
+    if created_at.tzinfo is None:
+        now = now.replace(tzinfo=None)
+    return max(0, (now - created_at).days)
+
+
+def _performance_data(report: AnalysisReport) -> Optional[dict]:
+    """
+    Serialize a report's performance tracking record, or None without one.
+    
+    days_since_analysis is derived from the report's creation time on every
+    read rather than taken from the stored column, which nothing keeps current.
+    """
+    perf = report.performance
+    if perf is None:
+        return None
+    return {
+        "report_id": str(perf.report_id),
+        "stock_symbol": perf.stock_symbol,
+        "original_price": perf.original_price,
+        "current_price": perf.current_price,
+        "performance_pct": perf.performance_pct,
+        "predicted_return": perf.predicted_return,
+        "actual_return": perf.actual_return,
+        "accuracy_score": perf.accuracy_score,
+        "days_since_analysis": _days_since(report.created_at),
+        "last_updated": perf.last_updated
+    }
+
+
 @router.get("/", response_model=ReportListResponse)
 async def get_reports(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     risk_level: Optional[RiskLevel] = Query(None, description="Filter by risk level"),
     timeframe: Optional[str] = Query(None, description="Filter by timeframe"),
@@ -34,11 +92,13 @@ async def get_reports(
     """
     Retrieve user's analysis reports with optional filtering.
     """
+    keyset = _decode_cursor(cursor)
+    
     try:
         report_manager = ReportManagerService(db)
-        reports = await report_manager.get_user_reports(
-            user_id=str(current_user.id),
-            skip=skip,
+        reports, next_cursor = await report_manager.get_user_reports(
+            user_id=current_user.id,
+            cursor=keyset,
             limit=limit,
             risk_level=risk_level,
             timeframe=timeframe,
@@ -48,21 +108,7 @@ async def get_reports(
         # Convert to response format
         report_responses = []
         for report in reports:
-            performance_data = None
-            if report.performance_tracking:
-                perf = report.performance_tracking[0]
-                performance_data = {
-                    "report_id": str(perf.report_id),
-                    "stock_symbol": perf.stock_symbol,
-                    "original_price": perf.original_price,
-                    "current_price": perf.current_price,
-                    "performance_pct": perf.performance_pct,
-                    "predicted_return": perf.predicted_return,
-                    "actual_return": perf.actual_return,
-                    "accuracy_score": perf.accuracy_score,
-                    "days_since_analysis": perf.days_since_analysis,
-                    "last_updated": perf.last_updated
-                }
+            performance_data = _performance_data(report)
             
             report_responses.append({
                 "id": str(report.id),
@@ -80,7 +126,7 @@ async def get_reports(
         return ReportListResponse(
             reports=report_responses,
             total=len(report_responses),  # In real implementation, get total count from DB
-            skip=skip,
+            next_cursor=_encode_cursor(next_cursor),
             limit=limit
         )
         
@@ -101,7 +147,7 @@ async def create_report(
     try:
         report_manager = ReportManagerService(db)
         report = await report_manager.save_analysis_report(
-            user_id=str(current_user.id),
+            user_id=current_user.id,
             stock_symbol=report_data.stock_symbol,
             parameters=report_data.parameters,
             results=report_data.results,
@@ -110,21 +156,7 @@ async def create_report(
         )
         
         # Convert to response format
-        performance_data = None
-        if report.performance_tracking:
-            perf = report.performance_tracking[0]
-            performance_data = {
-                "report_id": str(perf.report_id),
-                "stock_symbol": perf.stock_symbol,
-                "original_price": perf.original_price,
-                "current_price": perf.current_price,
-                "performance_pct": perf.performance_pct,
-                "predicted_return": perf.predicted_return,
-                "actual_return": perf.actual_return,
-                "accuracy_score": perf.accuracy_score,
-                "days_since_analysis": perf.days_since_analysis,
-                "last_updated": perf.last_updated
-            }
+        performance_data = _performance_data(report)
         
         return AnalysisReportResponse(
             id=str(report.id),
@@ -146,7 +178,7 @@ async def create_report(
 
 @router.get("/{report_id}", response_model=AnalysisReportResponse)
 async def get_report(
-    report_id: str,
+    report_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> AnalysisReportResponse:
@@ -155,32 +187,18 @@ async def get_report(
     """
     try:
         report_manager = ReportManagerService(db)
-        reports = await report_manager.get_user_reports(
-            user_id=str(current_user.id),
+        reports, _ = await report_manager.get_user_reports(
+            user_id=current_user.id,
             stock_symbol=None  # Get all reports, then filter by ID
         )
         
         # Find the specific report
-        report = next((r for r in reports if str(r.id) == report_id), None)
+        report = next((r for r in reports if r.id == report_id), None)
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
         
         # Convert to response format
-        performance_data = None
-        if report.performance_tracking:
-            perf = report.performance_tracking[0]
-            performance_data = {
-                "report_id": str(perf.report_id),
-                "stock_symbol": perf.stock_symbol,
-                "original_price": perf.original_price,
-                "current_price": perf.current_price,
-                "performance_pct": perf.performance_pct,
-                "predicted_return": perf.predicted_return,
-                "actual_return": perf.actual_return,
-                "accuracy_score": perf.accuracy_score,
-                "days_since_analysis": perf.days_since_analysis,
-                "last_updated": perf.last_updated
-            }
+        performance_data = _performance_data(report)
         
         return AnalysisReportResponse(
             id=str(report.id),
@@ -204,7 +222,7 @@ async def get_report(
 
 @router.post("/{report_id}/re-evaluate", response_model=ReEvaluationResponse)
 async def re_evaluate_report(
-    report_id: str,
+    report_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> ReEvaluationResponse:
@@ -215,12 +233,12 @@ async def re_evaluate_report(
         report_manager = ReportManagerService(db)
         
         # Verify the report belongs to the user
-        reports = await report_manager.get_user_reports(
-            user_id=str(current_user.id),
+        reports, _ = await report_manager.get_user_reports(
+            user_id=current_user.id,
             stock_symbol=None
         )
         
-        report = next((r for r in reports if str(r.id) == report_id), None)
+        report = next((r for r in reports if r.id == report_id), None)
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
         
@@ -238,7 +256,7 @@ async def re_evaluate_report(
 
 @router.get("/{report_id}/performance", response_model=PerformanceMetricsResponse)
 async def get_report_performance(
-    report_id: str,
+    report_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> PerformanceMetricsResponse:
@@ -249,12 +267,12 @@ async def get_report_performance(
         report_manager = ReportManagerService(db)
         
         # Verify the report belongs to the user
-        reports = await report_manager.get_user_reports(
-            user_id=str(current_user.id),
+        reports, _ = await report_manager.get_user_reports(
+            user_id=current_user.id,
             stock_symbol=None
         )
         
-        report = next((r for r in reports if str(r.id) == report_id), None)
+        report = next((r for r in reports if r.id == report_id), None)
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
         
@@ -280,7 +298,7 @@ async def get_performance_summary(
     """
     try:
         report_manager = ReportManagerService(db)
-        summary = await report_manager.get_performance_summary(str(current_user.id))
+        summary = await report_manager.get_performance_summary(current_user.id)
         
         return PerformanceSummaryResponse(**summary)
         
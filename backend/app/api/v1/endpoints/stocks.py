@@ -1,8 +1,11 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from collections import defaultdict
 import logging
+import numpy as np
 
 from app.core.database import get_db
 from app.services.market_data import market_data_service
@@ -12,6 +15,9 @@ from app.models.stock import Stock, StockData, TechnicalAnalysis, HistoricalData
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Most symbols one batch analysis request may ask for
+MAX_BATCH_SYMBOLS = 50
+
 
 @router.get("/")
 async def get_stocks(
@@ -76,6 +82,57 @@ async def search_stocks(
         raise HTTPException(status_code=500, detail="Failed to search stocks")
 
 
+@router.get("/analysis/batch")
+async def get_batch_analysis(
+    symbols: str = Query(..., description="Comma-separated stock symbols, e.g. CBA,BHP"),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    """
+    Get technical analysis for several stocks at once.
+    
+    Historical data for every symbol is fetched concurrently; symbols whose
+    data could not be fetched are left out of the analyses. Symbols with the
+    same number of bars are analysed together in one batch calculation.
+    """
+    requested = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(requested) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SYMBOLS} symbols per request")
+    
+    try:
+        histories = await market_data_service.get_bulk_historical_data(requested, "1y", "1d")
+        
+        by_length = defaultdict(list)
+        for symbol, historical_data in histories.items():
+            by_length[historical_data['count']].append(symbol)
+        
+        analyses = {}
+        for length, group in by_length.items():
+            bars = [histories[symbol]['data'] for symbol in group]
+            prices = np.array([[item['close'] for item in data] for data in bars], dtype=np.float64)
+            highs = np.array([[item['high'] for item in data] for data in bars], dtype=np.float64)
+            lows = np.array([[item['low'] for item in data] for data in bars], dtype=np.float64)
+            
+            batch = technical_analysis_service.calculate_batch(prices, highs, lows)
+            for symbol, indicators in zip(group, batch):
+                analyses[symbol] = {
+                    "indicators": indicators,
+                    "signals": technical_analysis_service.get_signal_summary(indicators),
+                    "data_points": length,
+                    "analysis_date": histories[symbol].get('timestamp')
+                }
+        
+        return ORJSONResponse({
+            "success": True,
+            "analyses": analyses,
+            "count": len(analyses)
+        })
+    except Exception as e:
+        logger.error(f"Error performing batch technical analysis for {symbols}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to perform technical analysis: {str(e)}")
+
+
 @router.get("/{symbol}/current")
 async def get_stock_current_price(
     symbol: str,
@@ -161,20 +218,22 @@ async def get_stock_analysis(
         highs = [item['high'] for item in historical_data['data']]
         lows = [item['low'] for item in historical_data['data']]
         
-        # Calculate technical indicators
-        indicators = technical_analysis_service.calculate_all_indicators(prices, highs, lows)
+        # Calculate technical indicators as arrays; orjson serializes them
+        # directly (NaN as null), so the response is returned as-is rather
+        # than going through FastAPI's per-element encoder
+        indicators = technical_analysis_service.calculate_all_indicators(prices, highs, lows, as_numpy=True)
         
         # Generate signal summary
         signals = technical_analysis_service.get_signal_summary(indicators)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "symbol": symbol,
             "indicators": indicators,
             "signals": signals,
             "data_points": len(prices),
             "analysis_date": historical_data.get('timestamp')
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
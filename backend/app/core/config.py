@@ -44,6 +44,9 @@ class Settings(BaseSettings):
             return "sqlite+aiosqlite:///./asx_research.db"
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    # Background refresh of report performance against current prices
+    REPORT_PERFORMANCE_REFRESH_SECONDS: int = 300
+    
     # Redis Settings
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
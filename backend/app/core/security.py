@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
 from jose import jwt
@@ -6,6 +7,10 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# HMAC verification takes tens of microseconds, less than a thread hand-off;
+# only RSA/ECDSA signatures are worth moving off the event loop
+OFFLOAD_TOKEN_VERIFICATION = not settings.ALGORITHM.startswith("HS")
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -40,3 +45,10 @@ def verify_token(token: str) -> Optional[str]:
         return user_id
     except jwt.JWTError:
         return None
+
+
+async def verify_token_async(token: str) -> Optional[str]:
+    """verify_token for async callers; asymmetric algorithms verify in a worker thread."""
+    if OFFLOAD_TOKEN_VERIFICATION:
+        return await asyncio.to_thread(verify_token, token)
+    return verify_token(token)
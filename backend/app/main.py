@@ -1,11 +1,22 @@
+import asyncio
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, AsyncSessionLocal
 from app.api.v1.api import api_router
+from app.services.market_data import market_data_service
+from app.services.report_manager import refresh_performance_periodically
+
+try:
+    from data_sources.alpha_vantage import close_session as close_alpha_vantage_session
+except ImportError:
+    # data_sources lives at the repository root, which is not on the path
+    # in every deployment; without it there is no session to close
+    close_alpha_vantage_session = None
 
 
 @asynccontextmanager
@@ -17,10 +28,22 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
+    # Keep report performance fresh off the request path
+    refresh_task = asyncio.create_task(
+        refresh_performance_periodically(AsyncSessionLocal, settings.REPORT_PERFORMANCE_REFRESH_SECONDS)
+    )
+    
     yield
     
     # Shutdown
     print("Shutting down Mug Punters Investment Research Platform...")
+    # Let the refresh loop unwind before the services it uses are closed
+    refresh_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresh_task
+    await market_data_service.close()
+    if close_alpha_vantage_session is not None:
+        await close_alpha_vantage_session()
 
 
 app = FastAPI(
@@ -28,6 +51,7 @@ app = FastAPI(
     description="A modern investment research platform for Australian Stock Exchange (ASX) analysis",
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, Text, Enum, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, Enum, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -218,6 +218,12 @@ class AnalysisReport(Base):
     # Analysis results (stored as JSON for comprehensive data)
     results = Column(JSON, nullable=False)  # All analysis results including scores, recommendations, metrics
     
+    # Headline results copied out of the results JSON for filtering and grouping
+    recommendation = Column(String(20), nullable=True)
+    confidence = Column(Float, nullable=True)
+    predicted_return = Column(Float, nullable=True)
+    target_price = Column(Float, nullable=True)
+    
     # Report metadata
     risk_level = Column(Enum(RiskLevel), nullable=False)
     timeframe = Column(String(20), nullable=False, default="1y")
@@ -229,7 +235,19 @@ class AnalysisReport(Base):
     
     # Relationships
     user = relationship("User")
-    performance_tracking = relationship("ReportPerformance", back_populates="report", cascade="all, delete-orphan")
+    performance = relationship(
+        "ReportPerformance",
+        back_populates="report",
+        uselist=False,
+        lazy="raise",
+        cascade="all, delete-orphan"
+    )
+    
+    __table_args__ = (
+        # Supports keyset pagination of a user's reports, newest first
+        Index("ix_analysis_reports_user_active_created", user_id, is_active, created_at.desc(), id.desc()),
+        Index("ix_analysis_reports_user_recommendation", user_id, recommendation),
+    )
 
 
 class ReportPerformance(Base):
@@ -253,7 +271,7 @@ class ReportPerformance(Base):
     accuracy_score = Column(Float, nullable=True)  # How accurate the prediction was (0-1)
     
     # Additional tracking data
-    days_since_analysis = Column(Integer, nullable=True)  # Days since original analysis
+    days_since_analysis = Column(Integer, nullable=True)  # Unused; the API derives it from the report's created_at
     market_conditions = Column(JSON, nullable=True)  # Market conditions at time of analysis vs current
     
     # Tracking metadata
@@ -261,4 +279,4 @@ class ReportPerformance(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    report = relationship("AnalysisReport", back_populates="performance_tracking")
\ No newline at end of file
+    report = relationship("AnalysisReport", back_populates="performance")
\ No newline at end of file
@@ -174,7 +174,7 @@ class AnalysisListItem(BaseModel):
 class AnalysisListResponse(BaseModel):
     analyses: List[AnalysisListItem] = Field(..., description="List of analyses")
     total: int = Field(..., ge=0, description="Total number of analyses")
-    skip: int = Field(..., ge=0, description="Number of records skipped")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
     limit: int = Field(..., ge=1, description="Maximum number of records returned")
 
 
@@ -309,7 +309,7 @@ class ReportListResponse(BaseModel):
     """Response schema for paginated report list."""
     reports: List[AnalysisReportResponse] = Field(..., description="List of reports")
     total: int = Field(..., ge=0, description="Total number of reports")
-    skip: int = Field(..., ge=0, description="Number of records skipped")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
     limit: int = Field(..., ge=1, description="Maximum number of records returned")
     
     class Config:
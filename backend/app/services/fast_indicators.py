@@ -0,0 +1,507 @@
+"""
+Fast Indicator Kernels
+
+Numba-compiled kernels for the recursive and rolling computations behind the
+technical indicators. All kernels operate on contiguous float64 arrays.
+
+Kernels are cached on disk and compiled (or loaded from the cache) when this
+module is imported, so no request pays the JIT cost.
+
+Numba is optional. Without it the EWMA-based indicators run as SciPy's
+compiled first-order IIR filter and the remaining kernels run as plain
+Python.
+"""
+
+from typing import List, Tuple
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    from scipy.signal import lfilter
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Fast-math without the no-NaN/no-Inf assumptions, for kernels that rely on
+# NaN to mark incomplete windows
+FASTMATH_NAN_SAFE = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _ewma(x: np.ndarray, alpha: float, out: np.ndarray) -> None:
+    """Exponentially weighted moving average, seeded with the first value."""
+    n = x.shape[0]
+    if n == 0:
+        return
+
+    out[0] = x[0]
+    decay = 1.0 - alpha
+    for i in range(1, n):
+        out[i] = alpha * x[i] + decay * out[i - 1]
+
+
+def _lfilter_ewma(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    EWMA along the last axis as the IIR filter y[i] = alpha*x[i] + (1-alpha)*y[i-1].
+
+    Used in place of the Numba kernel when Numba is not installed. The
+    initial filter state makes the output start at the first value.
+    """
+    if x.shape[-1] == 0:
+        return np.empty_like(x)
+
+    zi = (1.0 - alpha) * x[..., :1]
+    return lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=zi)[0]
+
+
+def ewma(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average over a span.
+
+    Equivalent to pandas' ewm(span=span, adjust=False).mean().
+    """
+    alpha = 2.0 / (span + 1)
+    if not HAVE_NUMBA:
+        return _lfilter_ewma(x, alpha)
+
+    out = np.empty_like(x)
+    _ewma(x, alpha, out)
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def _multi_ewma(x: np.ndarray, alphas: np.ndarray, out: np.ndarray) -> None:
+    """EWMA of x for each alpha, one row of out per alpha, rows in parallel."""
+    for row in prange(alphas.shape[0]):
+        _ewma(x, alphas[row], out[row])
+
+
+def multi_ewma(x: np.ndarray, spans: List[int]) -> np.ndarray:
+    """Exponential moving averages for several spans, one row per span."""
+    alphas = 2.0 / (np.asarray(spans, dtype=np.float64) + 1)
+    out = np.empty((alphas.shape[0], x.shape[0]))
+    if not HAVE_NUMBA:
+        for row, alpha in enumerate(alphas):
+            out[row] = _lfilter_ewma(x, alpha)
+        return out
+
+    _multi_ewma(x, alphas, out)
+    return out
+
+
+# Total weight of the prices an EMA dot product leaves out
+EMA_TAIL_WEIGHT = 1e-9
+
+
+def _make_weights(span: int, tail_len: int) -> np.ndarray:
+    """
+    EMA weights for the last tail_len values, oldest first.
+
+    The oldest value takes the whole remaining weight (1-alpha)^(tail_len-1),
+    as the seed of a seeded EWMA does, so the weights sum to one and the dot
+    product with a series of exactly tail_len values equals its EWMA.
+    """
+    decay = 1.0 - 2.0 / (span + 1)
+    weights = (1.0 - decay) * decay ** np.arange(tail_len - 1, -1, -1, dtype=np.float64)
+    weights[0] = decay ** (tail_len - 1)
+    return weights
+
+
+def _tail_length(span: int) -> int:
+    """Number of recent values holding all but EMA_TAIL_WEIGHT of an EMA."""
+    decay = 1.0 - 2.0 / (span + 1)
+    if decay <= 0.0:
+        return 1
+    return math.ceil(math.log(EMA_TAIL_WEIGHT) / math.log(decay)) + 1
+
+
+# Weight vectors for the spans the indicators use by default
+_EMA_WEIGHTS = {span: _make_weights(span, _tail_length(span)) for span in (9, 12, 14, 26, 50, 200)}
+
+
+def ewma_latest(x: np.ndarray, span: int) -> float:
+    """
+    Last value of ewma(x, span), as one dot product with precomputed weights.
+
+    Series up to the weight vector's length are weighted exactly; longer
+    ones drop prices whose total weight is below EMA_TAIL_WEIGHT.
+    """
+    n = x.shape[0]
+    if n == 0:
+        return math.nan
+
+    weights = _EMA_WEIGHTS.get(span)
+    if weights is None:
+        weights = _make_weights(span, _tail_length(span))
+    if n < weights.shape[0]:
+        weights = _make_weights(span, n)
+    return float(np.dot(weights, x[-weights.shape[0]:]))
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _macd_fused(
+    x: np.ndarray,
+    a_fast: float,
+    a_slow: float,
+    a_signal: float,
+    macd_out: np.ndarray,
+    signal_out: np.ndarray,
+    hist_out: np.ndarray,
+    fast_out: np.ndarray,
+    slow_out: np.ndarray
+) -> None:
+    """
+    MACD line, signal line and histogram in a single pass over x.
+
+    The fast and slow EMAs are written out too, so callers can reuse them
+    as moving averages instead of computing them again.
+    """
+    n = x.shape[0]
+    if n == 0:
+        return
+
+    ef = x[0]
+    es = x[0]
+    sg = 0.0
+    fast_out[0] = ef
+    slow_out[0] = es
+    macd_out[0] = 0.0
+    signal_out[0] = 0.0
+    hist_out[0] = 0.0
+    for i in range(1, n):
+        ef = a_fast * x[i] + (1.0 - a_fast) * ef
+        es = a_slow * x[i] + (1.0 - a_slow) * es
+        m = ef - es
+        sg = a_signal * m + (1.0 - a_signal) * sg
+        fast_out[i] = ef
+        slow_out[i] = es
+        macd_out[i] = m
+        signal_out[i] = sg
+        hist_out[i] = m - sg
+
+
+def macd(
+    x: np.ndarray,
+    fast: int,
+    slow: int,
+    signal: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram from EMAs over the given spans,
+    followed by the fast and slow EMAs themselves.
+    """
+    if not HAVE_NUMBA:
+        ema_fast = ewma(x, fast)
+        ema_slow = ewma(x, slow)
+        macd_line = ema_fast - ema_slow
+        signal_line = ewma(macd_line, signal)
+        return macd_line, signal_line, macd_line - signal_line, ema_fast, ema_slow
+
+    outputs = np.empty((5, x.shape[0]))
+    _macd_fused(x, 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1), *outputs)
+    return tuple(outputs)
+
+
+@njit(cache=True, fastmath=FASTMATH_NAN_SAFE, boundscheck=False)
+def _prefix_sums(x: np.ndarray, cumulative: np.ndarray) -> float:
+    """
+    Fill cumulative (length n + 1) with prefix sums of x and return the offset.
+
+    The sums are taken relative to the first value (the returned offset) to
+    keep them small and limit rounding drift on long series.
+    """
+    offset = x[0]
+    cumulative[0] = 0.0
+    for i in range(x.shape[0]):
+        cumulative[i + 1] = cumulative[i] + (x[i] - offset)
+    return offset
+
+
+@njit(cache=True, fastmath=FASTMATH_NAN_SAFE, boundscheck=False)
+def _sma_from_prefix_sums(cumulative: np.ndarray, offset: float, period: int, out: np.ndarray) -> None:
+    """SMA for one period from prefix sums, NaN until the window is full."""
+    n = out.shape[0]
+    for i in range(period - 1):
+        out[i] = np.nan
+    for i in range(period - 1, n):
+        out[i] = offset + (cumulative[i + 1] - cumulative[i + 1 - period]) / period
+
+
+@njit(parallel=True, cache=True, fastmath=FASTMATH_NAN_SAFE, boundscheck=False)
+def _multi_sma(x: np.ndarray, periods: np.ndarray, out: np.ndarray) -> None:
+    """
+    SMA of x for each period, one row of out per period, rows in parallel.
+
+    Each window sum is the difference of two prefix sums, so the cost is
+    O(n) whatever the period; the prefix sums are shared by every period.
+    """
+    cumulative = np.empty(x.shape[0] + 1)
+    offset = _prefix_sums(x, cumulative)
+    for row in prange(periods.shape[0]):
+        _sma_from_prefix_sums(cumulative, offset, periods[row], out[row])
+
+
+def multi_sma(x: np.ndarray, periods: List[int]) -> np.ndarray:
+    """Simple moving averages for several periods (each <= len(x)), one row per period."""
+    periods_array = np.asarray(periods, dtype=np.int64)
+    out = np.empty((periods_array.shape[0], x.shape[0]))
+    if x.shape[0] > 0:
+        _multi_sma(x, periods_array, out)
+    return out
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _rolling_mean_std(x: np.ndarray, period: int, mean_out: np.ndarray, std_out: np.ndarray) -> None:
+    """
+    Rolling mean and sample standard deviation, from index period - 1 on.
+
+    Uses Welford's update, extended to slide the window: each step adds the
+    incoming value and removes the outgoing one in O(1).
+    """
+    n = x.shape[0]
+    if n < period:
+        return
+
+    mean = 0.0
+    m2 = 0.0
+    for i in range(period):
+        delta = x[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x[i] - mean)
+
+    mean_out[period - 1] = mean
+    std_out[period - 1] = np.sqrt(max(m2, 0.0) / (period - 1))
+
+    for i in range(period, n):
+        add = x[i]
+        drop = x[i - period]
+        new_mean = mean + (add - drop) / period
+        m2 += (add - drop) * (add - new_mean + drop - mean)
+        mean = new_mean
+
+        mean_out[i] = mean
+        std_out[i] = np.sqrt(max(m2, 0.0) / (period - 1))
+
+
+def rolling_mean_std(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and sample standard deviation (ddof=1) in a single pass.
+
+    Both are NaN until the window is full, matching pandas' rolling().mean()
+    and rolling().std().
+    """
+    mean = np.full(x.shape[0], np.nan)
+    std = np.full(x.shape[0], np.nan)
+    if period > 1:
+        _rolling_mean_std(x, period, mean, std)
+    elif period == 1:
+        mean[:] = x
+    return mean, std
+
+
+@njit(cache=True, fastmath=FASTMATH_NAN_SAFE, boundscheck=False, error_model='numpy')
+def _stoch(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int,
+    d_period: int,
+    k_out: np.ndarray,
+    d_out: np.ndarray
+) -> None:
+    """
+    Stochastic %K and %D in a single pass.
+
+    The window's highest high and lowest low come from monotonic deques of
+    indices (ring buffers of k_period slots), so each is amortized O(1) per
+    step. %D is a running sum over the last d_period %K values. Outputs are
+    only written once their window is full; a flat window yields NaN %K.
+    """
+    n = close.shape[0]
+    max_idx = np.empty(k_period, dtype=np.int64)
+    min_idx = np.empty(k_period, dtype=np.int64)
+    max_head = max_len = 0
+    min_head = min_len = 0
+    d_sum = 0.0
+    d_nans = 0
+
+    for i in range(n):
+        # Expire the index that just left the window
+        if max_len > 0 and max_idx[max_head] <= i - k_period:
+            max_head = (max_head + 1) % k_period
+            max_len -= 1
+        if min_len > 0 and min_idx[min_head] <= i - k_period:
+            min_head = (min_head + 1) % k_period
+            min_len -= 1
+
+        # Drop indices the new bar dominates, then append it
+        while max_len > 0 and high[max_idx[(max_head + max_len - 1) % k_period]] <= high[i]:
+            max_len -= 1
+        max_idx[(max_head + max_len) % k_period] = i
+        max_len += 1
+
+        while min_len > 0 and low[min_idx[(min_head + min_len - 1) % k_period]] >= low[i]:
+            min_len -= 1
+        min_idx[(min_head + min_len) % k_period] = i
+        min_len += 1
+
+        if i < k_period - 1:
+            continue
+
+        highest = high[max_idx[max_head]]
+        lowest = low[min_idx[min_head]]
+        k_value = 100.0 * (close[i] - lowest) / (highest - lowest)
+        k_out[i] = k_value
+
+        if np.isnan(k_value):
+            d_nans += 1
+        else:
+            d_sum += k_value
+        if i >= k_period - 1 + d_period:
+            dropped = k_out[i - d_period]
+            if np.isnan(dropped):
+                d_nans -= 1
+            else:
+                d_sum -= dropped
+        if i >= k_period + d_period - 2:
+            d_out[i] = d_sum / d_period if d_nans == 0 else np.nan
+
+
+def stochastic(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int,
+    d_period: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic %K and %D, NaN until each window is full."""
+    n = close.shape[0]
+    if high.shape[0] != n or low.shape[0] != n:
+        raise ValueError("high, low and close must be the same length")
+
+    k_percent = np.full(n, np.nan)
+    d_percent = np.full(n, np.nan)
+    _stoch(high, low, close, k_period, d_period, k_percent, d_percent)
+    return k_percent, d_percent
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def _batch_ewma(x: np.ndarray, alpha: float, out: np.ndarray) -> None:
+    """EWMA of each row of x (one symbol per row), rows in parallel."""
+    for row in prange(x.shape[0]):
+        _ewma(x[row], alpha, out[row])
+
+
+def batch_ewma(x: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average of each row of a (symbols, bars) matrix."""
+    alpha = 2.0 / (span + 1)
+    if not HAVE_NUMBA:
+        return _lfilter_ewma(x, alpha)
+
+    out = np.empty_like(x)
+    _batch_ewma(x, alpha, out)
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=FASTMATH_NAN_SAFE, boundscheck=False)
+def _batch_sma(x: np.ndarray, periods: np.ndarray, out: np.ndarray) -> None:
+    """SMA of each row of x for each period into out[row, period], rows in parallel."""
+    for row in prange(x.shape[0]):
+        cumulative = np.empty(x.shape[1] + 1)
+        offset = _prefix_sums(x[row], cumulative)
+        for p in range(periods.shape[0]):
+            _sma_from_prefix_sums(cumulative, offset, periods[p], out[row, p])
+
+
+def batch_sma(x: np.ndarray, periods: List[int]) -> np.ndarray:
+    """
+    Simple moving averages of each row of a (symbols, bars) matrix.
+
+    Returns a (symbols, periods, bars) array; each period must be <= bars.
+    """
+    periods_array = np.asarray(periods, dtype=np.int64)
+    out = np.empty((x.shape[0], periods_array.shape[0], x.shape[1]))
+    if x.shape[1] > 0:
+        _batch_sma(x, periods_array, out)
+    return out
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def _batch_rolling_mean_std(x: np.ndarray, period: int, mean_out: np.ndarray, std_out: np.ndarray) -> None:
+    """Rolling mean and std of each row of x, rows in parallel."""
+    for row in prange(x.shape[0]):
+        _rolling_mean_std(x[row], period, mean_out[row], std_out[row])
+
+
+def batch_rolling_mean_std(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sample std (ddof=1) of each row of a (symbols, bars) matrix."""
+    mean = np.full(x.shape, np.nan)
+    std = np.full(x.shape, np.nan)
+    if period > 1:
+        _batch_rolling_mean_std(x, period, mean, std)
+    elif period == 1:
+        mean[:] = x
+    return mean, std
+
+
+@njit(parallel=True, cache=True, fastmath=FASTMATH_NAN_SAFE, boundscheck=False, error_model='numpy')
+def _batch_stoch(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int,
+    d_period: int,
+    k_out: np.ndarray,
+    d_out: np.ndarray
+) -> None:
+    """Stochastic %K and %D of each row, rows in parallel."""
+    for row in prange(close.shape[0]):
+        _stoch(high[row], low[row], close[row], k_period, d_period, k_out[row], d_out[row])
+
+
+def batch_stochastic(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int,
+    d_period: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic %K and %D of each row of (symbols, bars) matrices."""
+    if high.shape != close.shape or low.shape != close.shape:
+        raise ValueError("high, low and close must have the same shape")
+
+    k_percent = np.full(close.shape, np.nan)
+    d_percent = np.full(close.shape, np.nan)
+    _batch_stoch(high, low, close, k_period, d_period, k_percent, d_percent)
+    return k_percent, d_percent
+
+
+def _warm_up() -> None:
+    """Compile every kernel for float64 arrays with a small synthetic series."""
+    x = np.arange(300, dtype=np.float64)
+    out = np.empty_like(x)
+    _ewma(x, 0.5, out)
+    _macd_fused(x, 0.5, 0.25, 0.2, *np.empty((5, x.shape[0])))
+    _multi_ewma(x, np.array([0.5, 0.25]), np.empty((2, x.shape[0])))
+    _multi_sma(x, np.array([5, 20], dtype=np.int64), np.empty((2, x.shape[0])))
+    _rolling_mean_std(x, 20, out, np.empty_like(x))
+    _stoch(x + 1.0, x - 1.0, x, 14, 3, out, np.empty_like(x))
+
+    matrix = np.vstack((x, x))
+    _batch_ewma(matrix, 0.5, np.empty_like(matrix))
+    _batch_sma(matrix, np.array([5, 20], dtype=np.int64), np.empty((2, 2, x.shape[0])))
+    _batch_rolling_mean_std(matrix, 20, np.empty_like(matrix), np.empty_like(matrix))
+    _batch_stoch(matrix + 1.0, matrix - 1.0, matrix, 14, 3, np.empty_like(matrix), np.empty_like(matrix))
+
+
+if HAVE_NUMBA:
+    _warm_up()
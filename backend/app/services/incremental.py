@@ -0,0 +1,226 @@
+"""
+Incremental Indicators
+
+Stateful versions of the technical indicators for live price feeds. Each
+state is warmed up once from a price history with batch_init() and then
+advanced one bar at a time with update(), in O(1) per bar instead of
+recomputing the whole series.
+
+After the same prices, a state's value matches the last element of the
+corresponding TechnicalAnalysisService series, before rounding.
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import math
+
+import numpy as np
+
+from app.services.fast_indicators import ewma_latest, macd
+
+
+class EMAState:
+    """
+    Exponential moving average over a span, seeded with the first price.
+
+    The running average is kept in ema from the first price on; value and
+    update() report None until period prices have been seen.
+    """
+
+    __slots__ = ('period', 'alpha', 'count', 'ema')
+
+    def __init__(self, period: int = 12):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.count = 0
+        self.ema: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        """The current EMA, or None for insufficient data."""
+        return self.ema if self.count >= self.period else None
+
+    def update(self, price: float) -> Optional[float]:
+        """Add a price and return the new EMA."""
+        if self.ema is None:
+            self.ema = float(price)
+        else:
+            self.ema = self.alpha * price + (1.0 - self.alpha) * self.ema
+        self.count += 1
+        return self.value
+
+    def batch_init(self, prices: List[float]) -> Optional[float]:
+        """Reset the state from a price history and return the latest EMA."""
+        close = np.ascontiguousarray(prices, dtype=np.float64)
+        self.count = len(close)
+        self.ema = ewma_latest(close, self.period) if self.count else None
+        return self.value
+
+
+class RSIState:
+    """
+    Relative Strength Index.
+
+    Gains and losses are smoothed with span-based EMAs, as calculate_rsi
+    does. update() returns None until period + 1 prices have been seen.
+    """
+
+    __slots__ = ('period', 'count', 'last_price', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.last_price: Optional[float] = None
+        self.avg_gain = EMAState(period)
+        self.avg_loss = EMAState(period)
+
+    @property
+    def value(self) -> Optional[float]:
+        """The current RSI, or None for insufficient data or a flat history."""
+        if self.count < self.period + 1:
+            return None
+
+        avg_gain = self.avg_gain.ema
+        avg_loss = self.avg_loss.ema
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else None
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def update(self, price: float) -> Optional[float]:
+        """Add a price and return the new RSI."""
+        delta = 0.0 if self.last_price is None else price - self.last_price
+        self.avg_gain.update(delta if delta > 0 else 0.0)
+        self.avg_loss.update(-delta if delta < 0 else 0.0)
+        self.last_price = float(price)
+        self.count += 1
+        return self.value
+
+    def batch_init(self, prices: List[float]) -> Optional[float]:
+        """Reset the state from a price history and return the latest RSI."""
+        close = np.ascontiguousarray(prices, dtype=np.float64)
+        self.count = len(close)
+        self.last_price = float(close[-1]) if self.count else None
+
+        delta = np.diff(close, prepend=close[:1])
+        self.avg_gain.batch_init(np.where(delta > 0, delta, 0.0))
+        self.avg_loss.batch_init(np.where(delta < 0, -delta, 0.0))
+        return self.value
+
+
+class MACDState:
+    """
+    Moving Average Convergence Divergence.
+
+    update() returns 'macd', 'signal' and 'histogram' values, all None until
+    slow_period prices have been seen.
+    """
+
+    __slots__ = ('slow_period', 'count', 'fast', 'slow', 'signal')
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.slow_period = slow_period
+        self.count = 0
+        self.fast = EMAState(fast_period)
+        self.slow = EMAState(slow_period)
+        self.signal = EMAState(signal_period)
+
+    @property
+    def value(self) -> Dict[str, Optional[float]]:
+        """The current MACD line, signal line and histogram."""
+        if self.count < self.slow_period:
+            return {'macd': None, 'signal': None, 'histogram': None}
+
+        macd = self.fast.ema - self.slow.ema
+        return {'macd': macd, 'signal': self.signal.ema, 'histogram': macd - self.signal.ema}
+
+    def update(self, price: float) -> Dict[str, Optional[float]]:
+        """Add a price and return the new MACD values."""
+        self.fast.update(price)
+        self.slow.update(price)
+        self.signal.update(self.fast.ema - self.slow.ema)
+        self.count += 1
+        return self.value
+
+    def batch_init(self, prices: List[float]) -> Dict[str, Optional[float]]:
+        """
+        Reset the state from a price history and return the latest MACD values.
+
+        One MACD pass yields the fast, slow and signal EMAs over the whole
+        history; each state is seeded with the last value of its series.
+        """
+        close = np.ascontiguousarray(prices, dtype=np.float64)
+        self.count = len(close)
+        for state in (self.fast, self.slow, self.signal):
+            state.count = self.count
+            state.ema = None
+
+        if self.count:
+            _, signal_line, _, ema_fast, ema_slow = macd(
+                close, self.fast.period, self.slow.period, self.signal.period
+            )
+            self.fast.ema = float(ema_fast[-1])
+            self.slow.ema = float(ema_slow[-1])
+            self.signal.ema = float(signal_line[-1])
+        return self.value
+
+
+class BollingerState:
+    """
+    Bollinger Bands over a sliding window.
+
+    Keeps the window's prices with a Welford mean and M2 that are updated
+    in O(1) as prices enter and leave. update() returns 'upper', 'middle'
+    and 'lower' values, all None until the window is full.
+    """
+
+    __slots__ = ('period', 'std_dev', 'window', 'mean', 'm2')
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        self.period = period
+        self.std_dev = std_dev
+        self.window: Deque[float] = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def value(self) -> Dict[str, Optional[float]]:
+        """The current upper, middle and lower bands."""
+        if len(self.window) < self.period or self.period < 2:
+            return {'upper': None, 'middle': None, 'lower': None}
+
+        width = self.std_dev * math.sqrt(max(self.m2, 0.0) / (self.period - 1))
+        return {'upper': self.mean + width, 'middle': self.mean, 'lower': self.mean - width}
+
+    def update(self, price: float) -> Dict[str, Optional[float]]:
+        """Add a price and return the new bands."""
+        price = float(price)
+        self.window.append(price)
+
+        if len(self.window) <= self.period:
+            delta = price - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (price - self.mean)
+        else:
+            dropped = self.window.popleft()
+            new_mean = self.mean + (price - dropped) / self.period
+            self.m2 += (price - dropped) * (price - new_mean + dropped - self.mean)
+            self.mean = new_mean
+
+        return self.value
+
+    def batch_init(self, prices: List[float]) -> Dict[str, Optional[float]]:
+        """Reset the state from a price history and return the latest bands."""
+        self.window = deque(float(price) for price in prices[-self.period:])
+        window = np.fromiter(self.window, dtype=np.float64)
+        self.mean = float(window.mean()) if len(window) else 0.0
+        self.m2 = float(((window - self.mean) ** 2).sum())
+        return self.value
+
+
+# Indicator name -> state class, for TechnicalAnalysisService.create_stateful
+STATE_CLASSES = {
+    'ema': EMAState,
+    'rsi': RSIState,
+    'macd': MACDState,
+    'bollinger_bands': BollingerState
+}
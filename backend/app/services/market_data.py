@@ -1,15 +1,64 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone, tzinfo
 from typing import Dict, List, Optional, Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import yfinance as yf
 import pandas as pd
+import numpy as np
+import orjson
+import aiohttp
 from functools import lru_cache
+import sys
 import time
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+
+
+@lru_cache(maxsize=1024)
+def _format_asx_symbol(symbol: str) -> str:
+    """Format symbol for ASX (add .AX suffix if not present)."""
+    symbol = symbol.upper().strip()
+    if not symbol.endswith('.AX'):
+        symbol += '.AX'
+    return sys.intern(symbol)
+
+
+def _exchange_timezone(name: Optional[str], gmtoffset: int) -> tzinfo:
+    """
+    Exchange timezone for chart timestamps.
+    
+    Uses the named zone so bars either side of a daylight saving change get
+    their own offset; the fixed gmtoffset is only a fallback.
+    """
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Unknown exchange timezone {name}; using a fixed offset")
+    return timezone(timedelta(seconds=gmtoffset))
+
+
+@lru_cache(maxsize=4096)
+def _price_key(symbol: str) -> str:
+    """Cache key for current price data."""
+    return "price_" + symbol
+
+
+@lru_cache(maxsize=4096)
+def _info_key(symbol: str) -> str:
+    """Cache key for company info."""
+    return "info_" + symbol
+
+
+@lru_cache(maxsize=4096)
+def _hist_key(symbol: str, period: str, interval: str) -> str:
+    """Cache key for historical data."""
+    return "historical_" + symbol + "_" + period + "_" + interval
+
 
 class MarketDataService:
     """
@@ -17,11 +66,20 @@ class MarketDataService:
     Includes caching, rate limiting, and error handling.
     """
     
+    __slots__ = (
+        'cache_duration',
+        '_cache',
+        '_last_request_time',
+        'min_request_interval',
+        '_session',
+    )
+    
     def __init__(self):
         self.cache_duration = 300  # 5 minutes in seconds
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._last_request_time = 0
         self.min_request_interval = 1  # Minimum 1 second between requests
+        self._session: Optional[aiohttp.ClientSession] = None
         
     def _is_cache_valid(self, cache_key: str) -> bool:
         """Check if cached data is still valid."""
@@ -39,10 +97,20 @@ class MarketDataService:
         return None
     
     def _set_cache(self, cache_key: str, data: Any) -> None:
-        """Store data in cache with timestamp."""
+        """
+        Store data in cache with timestamp.
+        
+        Dict payloads are stamped with the fetch time here, once, so cache
+        hits report when the data was fetched rather than when it was served.
+        List payloads (search results) are deliberately left unstamped: they
+        never carried a timestamp, and adding one would change their type.
+        """
+        now = time.time()
+        if isinstance(data, dict):
+            data['timestamp'] = datetime.fromtimestamp(now, timezone.utc).isoformat().replace('+00:00', 'Z')
         self._cache[cache_key] = {
             'data': data,
-            'timestamp': time.time()
+            'timestamp': now
         }
         logger.debug(f"Cached data for key: {cache_key}")
     
@@ -58,12 +126,109 @@ class MarketDataService:
         
         self._last_request_time = time.time()
     
-    def _format_asx_symbol(self, symbol: str) -> str:
-        """Format symbol for ASX (add .AX suffix if not present)."""
-        symbol = symbol.upper().strip()
-        if not symbol.endswith('.AX'):
-            symbol += '.AX'
-        return symbol
+    _format_asx_symbol = staticmethod(_format_asx_symbol)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=128, limit_per_host=64, keepalive_timeout=75),
+                headers={'User-Agent': 'Mozilla/5.0'},
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def _fetch_chart_aio(self, symbol: str, period: str, interval: str) -> Dict[str, Any]:
+        """
+        Fetch raw OHLCV arrays from Yahoo's chart endpoint.
+        
+        Skips yfinance's DataFrame construction but matches what
+        ``ticker.history`` returns: rows without a close price are dropped
+        and prices are adjusted for splits and dividends (auto_adjust), with
+        open, high and low scaled by the same ratio as the close.
+        """
+        async with self._get_session().get(
+            f"{CHART_URL}/{symbol}",
+            params={"range": period, "interval": interval, "includePrePost": "false"}
+        ) as response:
+            response.raise_for_status()
+            chart = orjson.loads(await response.read()).get('chart') or {}
+        
+        if chart.get('error') or not chart.get('result'):
+            raise ValueError(f"No historical data found for symbol: {symbol}")
+        
+        result = chart['result'][0]
+        timestamps = result.get('timestamp')
+        if not timestamps:
+            raise ValueError(f"No historical data found for symbol: {symbol}")
+        
+        quote = result['indicators']['quote'][0]
+        adjclose = result['indicators'].get('adjclose')
+        meta = result.get('meta', {})
+        
+        close = np.asarray(quote['close'], dtype=float)
+        valid = ~np.isnan(close)
+        close = close[valid]
+        volume = np.nan_to_num(np.asarray(quote['volume'], dtype=float)[valid])
+        
+        # Intraday charts carry no adjclose; their prices are used as is
+        if adjclose:
+            adjusted_close = np.asarray(adjclose[0]['adjclose'], dtype=float)[valid]
+            ratio = np.where(np.isnan(adjusted_close), 1.0, adjusted_close / close)
+            close = np.where(np.isnan(adjusted_close), close, adjusted_close)
+        else:
+            ratio = 1.0
+        
+        return {
+            'timestamp': np.asarray(timestamps, dtype=np.int64)[valid],
+            'open': np.asarray(quote['open'], dtype=float)[valid] * ratio,
+            'high': np.asarray(quote['high'], dtype=float)[valid] * ratio,
+            'low': np.asarray(quote['low'], dtype=float)[valid] * ratio,
+            'close': close,
+            'volume': volume.astype(np.int64),
+            'timezone': _exchange_timezone(meta.get('exchangeTimezoneName'), meta.get('gmtoffset', 0))
+        }
+    
+    def _build_historical_result(
+        self,
+        formatted_symbol: str,
+        period: str,
+        interval: str,
+        chart: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Convert chart arrays to the JSON-serialisable historical payload."""
+        if not len(chart['close']):
+            raise ValueError(f"No historical data found for symbol: {formatted_symbol}")
+        
+        tz = chart['timezone']
+        historical_data = []
+        for ts, open_, high, low, close, volume in zip(
+            chart['timestamp'].tolist(),
+            chart['open'].tolist(),
+            chart['high'].tolist(),
+            chart['low'].tolist(),
+            chart['close'].tolist(),
+            chart['volume'].tolist()
+        ):
+            date = datetime.fromtimestamp(ts, tz)
+            historical_data.append({
+                'date': date.strftime('%Y-%m-%d'),
+                'datetime': date.isoformat(),
+                'open': open_,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': volume,
+                'adj_close': close  # Prices are already adjusted, as with history()
+            })
+        
+        return {
+            'symbol': formatted_symbol,
+            'period': period,
+            'interval': interval,
+            'data': historical_data,
+            'count': len(historical_data)
+        }
     
     async def get_stock_price(self, symbol: str) -> Dict[str, Any]:
         """
@@ -77,7 +242,7 @@ class MarketDataService:
         """
         try:
             formatted_symbol = self._format_asx_symbol(symbol)
-            cache_key = f"price_{formatted_symbol}"
+            cache_key = _price_key(formatted_symbol)
             
             # Check cache first
             cached_data = self._get_from_cache(cache_key)
@@ -96,7 +261,8 @@ class MarketDataService:
             if hist.empty:
                 raise ValueError(f"No data found for symbol: {formatted_symbol}")
             
-            current_price = hist['Close'].iloc[-1]
+            last = hist.iloc[-1]
+            current_price = last['Close']
             previous_close = info.get('previousClose', current_price)
             change = current_price - previous_close
             change_percent = (change / previous_close) * 100 if previous_close else 0
@@ -107,11 +273,10 @@ class MarketDataService:
                 'previous_close': float(previous_close),
                 'change': float(change),
                 'change_percent': float(change_percent),
-                'volume': int(hist['Volume'].iloc[-1]) if not hist.empty else 0,
-                'high': float(hist['High'].iloc[-1]) if not hist.empty else None,
-                'low': float(hist['Low'].iloc[-1]) if not hist.empty else None,
-                'open': float(hist['Open'].iloc[-1]) if not hist.empty else None,
-                'timestamp': datetime.now().isoformat(),
+                'volume': int(last['Volume']),
+                'high': float(last['High']),
+                'low': float(last['Low']),
+                'open': float(last['Open']),
                 'market_cap': info.get('marketCap'),
                 'currency': info.get('currency', 'AUD')
             }
@@ -138,7 +303,7 @@ class MarketDataService:
         """
         try:
             formatted_symbol = self._format_asx_symbol(symbol)
-            cache_key = f"info_{formatted_symbol}"
+            cache_key = _info_key(formatted_symbol)
             
             # Check cache first
             cached_data = self._get_from_cache(cache_key)
@@ -176,8 +341,7 @@ class MarketDataService:
                 '52_week_high': info.get('fiftyTwoWeekHigh'),
                 '52_week_low': info.get('fiftyTwoWeekLow'),
                 'currency': info.get('currency', 'AUD'),
-                'exchange': info.get('exchange', 'ASX'),
-                'timestamp': datetime.now().isoformat()
+                'exchange': info.get('exchange', 'ASX')
             }
             
             # Cache the result
@@ -209,7 +373,7 @@ class MarketDataService:
         """
         try:
             formatted_symbol = self._format_asx_symbol(symbol)
-            cache_key = f"historical_{formatted_symbol}_{period}_{interval}"
+            cache_key = _hist_key(formatted_symbol, period, interval)
             
             # Check cache first
             cached_data = self._get_from_cache(cache_key)
@@ -219,45 +383,75 @@ class MarketDataService:
             await self._rate_limit()
             
             # Fetch from Yahoo Finance
-            ticker = yf.Ticker(formatted_symbol)
-            hist = ticker.history(period=period, interval=interval)
-            
-            if hist.empty:
-                raise ValueError(f"No historical data found for symbol: {formatted_symbol}")
-            
-            # Convert to list of dictionaries for JSON serialization
-            historical_data = []
-            for date, row in hist.iterrows():
-                historical_data.append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'datetime': date.isoformat(),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume']),
-                    'adj_close': float(row['Adj Close']) if 'Adj Close' in row else float(row['Close'])
-                })
-            
-            result = {
-                'symbol': formatted_symbol,
-                'period': period,
-                'interval': interval,
-                'data': historical_data,
-                'count': len(historical_data),
-                'timestamp': datetime.now().isoformat()
-            }
+            chart = await self._fetch_chart_aio(formatted_symbol, period, interval)
+            result = self._build_historical_result(formatted_symbol, period, interval, chart)
             
             # Cache the result
             self._set_cache(cache_key, result)
             
-            logger.info(f"Successfully fetched {len(historical_data)} historical data points for {formatted_symbol}")
+            logger.info(f"Successfully fetched {result['count']} historical data points for {formatted_symbol}")
             return result
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
             raise Exception(f"Failed to fetch historical data: {str(e)}")
     
+    async def get_bulk_historical_data(
+        self,
+        symbols: List[str],
+        period: str = "1y",
+        interval: str = "1d"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get historical price data for many ASX stocks concurrently.
+        
+        Cache misses are fetched in a single asyncio.gather fan-out; the
+        connector's per-host limit bounds the number of open requests.
+        
+        Args:
+            symbols: Stock symbols (e.g., ['CBA', 'BHP.AX'])
+            period: Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            
+        Returns:
+            Dict mapping formatted symbol to its historical payload; symbols
+            that failed to fetch are omitted
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        to_fetch: List[str] = []
+        
+        for symbol in dict.fromkeys(self._format_asx_symbol(s) for s in symbols):
+            cached_data = self._get_from_cache(_hist_key(symbol, period, interval))
+            if cached_data:
+                results[symbol] = cached_data
+            else:
+                to_fetch.append(symbol)
+        
+        if not to_fetch:
+            return results
+        
+        await self._rate_limit()
+        
+        charts = await asyncio.gather(
+            *(self._fetch_chart_aio(symbol, period, interval) for symbol in to_fetch),
+            return_exceptions=True
+        )
+        
+        for symbol, chart in zip(to_fetch, charts):
+            try:
+                if isinstance(chart, BaseException):
+                    raise chart
+                result = self._build_historical_result(symbol, period, interval, chart)
+            except Exception as e:
+                logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
+                continue
+            
+            self._set_cache(_hist_key(symbol, period, interval), result)
+            results[symbol] = result
+        
+        logger.info(f"Fetched historical data for {len(results)}/{len(symbols)} symbols")
+        return results
+    
     async def search_stocks(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search for ASX stocks by name or symbol.
@@ -320,6 +514,12 @@ class MarketDataService:
             logger.error(f"Error searching stocks for query {query}: {str(e)}")
             raise Exception(f"Failed to search stocks: {str(e)}")
     
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self._cache.clear()
@@ -4,13 +4,18 @@ Report Manager Service
 Handles saving, retrieving, and tracking analysis reports with performance monitoring.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Callable
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, select, update, bindparam, lambda_stmt, and_, or_, desc, func, case
+from sqlalchemy.orm import selectinload, joinedload, raiseload, load_only
+import asyncio
+import bisect
+import math
 import uuid
 import logging
+import numpy as np
+from cachetools import TTLCache
 
 from app.models.analysis import AnalysisReport, ReportPerformance, RiskLevel
 from app.models.user import User
@@ -18,6 +23,42 @@ from app.services.market_data import MarketDataService
 
 logger = logging.getLogger(__name__)
 
+# Process-wide current price cache by symbol, bounded so symbols priced
+# once do not stay in memory for the life of the process
+PRICE_CACHE_TTL = 60.0
+PRICE_CACHE_SIZE = 10000
+_price_cache: TTLCache = TTLCache(maxsize=PRICE_CACHE_SIZE, ttl=PRICE_CACHE_TTL)
+_price_inflight: Dict[str, asyncio.Event] = {}
+
+# Performance distribution buckets, lowest first, split at these percentages
+PERFORMANCE_BUCKETS = ("terrible", "poor", "neutral", "good", "excellent")
+PERFORMANCE_BUCKET_EDGES = np.array([-10.0, -5.0, 5.0, 10.0])
+
+# Performance summaries by performance_pct and letter grades by accuracy_score
+PERFORMANCE_SUMMARY_EDGES = (-5.0, 0.0, 5.0)
+PERFORMANCE_SUMMARIES = (
+    "Negative performance",
+    "Neutral performance",
+    "Positive performance",
+    "Strong positive performance"
+)
+PERFORMANCE_GRADE_EDGES = (0.5, 0.6, 0.7, 0.8)
+PERFORMANCE_GRADES = ("F", "D", "C", "B", "A")
+
+
+def _result_float(results: Dict[str, Any], name: str) -> Optional[float]:
+    """A numeric analysis result as a finite float, or None if missing or malformed."""
+    value = results.get(name)
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        if value is not None:
+            logger.warning(f"Ignoring non-numeric {name} result: {value!r}")
+        return None
+    return number if math.isfinite(number) else None
+
 
 class ReportManagerService:
     """Service for managing analysis reports and performance tracking."""
@@ -28,7 +69,7 @@ class ReportManagerService:
     
     async def save_analysis_report(
         self,
-        user_id: str,
+        user_id: uuid.UUID,
         stock_symbol: str,
         parameters: Dict[str, Any],
         results: Dict[str, Any],
@@ -53,19 +94,29 @@ class ReportManagerService:
             # Get current stock price for performance tracking
             current_price = await self._get_current_stock_price(stock_symbol)
             
-            # Create the analysis report
+            # Headline results go into typed columns, so malformed values are
+            # stored as NULL there; the results JSON keeps them as given
+            recommendation = results.get('recommendation')
+            if not isinstance(recommendation, str) or len(recommendation) > AnalysisReport.recommendation.type.length:
+                recommendation = None
+            predicted_return = _result_float(results, 'predicted_return')
+            
+            # Create the analysis report; the ID is generated client-side so
+            # both rows can be inserted in a single flush
             report = AnalysisReport(
-                user_id=uuid.UUID(user_id),
+                id=uuid.uuid4(),
+                user_id=user_id,
                 stock_symbol=stock_symbol.upper(),
                 parameters=parameters,
                 results=results,
+                recommendation=recommendation,
+                confidence=_result_float(results, 'confidence'),
+                predicted_return=predicted_return,
+                target_price=_result_float(results, 'target_price'),
                 risk_level=risk_level,
                 timeframe=timeframe
             )
             
-            self.db.add(report)
-            await self.db.flush()  # Get the ID
-            
             # Create initial performance tracking entry
             performance = ReportPerformance(
                 report_id=report.id,
@@ -73,13 +124,13 @@ class ReportManagerService:
                 original_price=current_price,
                 current_price=current_price,
                 performance_pct=0.0,
-                predicted_return=results.get('predicted_return', 0.0),
+                predicted_return=predicted_return or 0.0,
                 actual_return=0.0,
-                accuracy_score=None,  # Will be calculated later
-                days_since_analysis=0
+                accuracy_score=None  # Will be calculated later
             )
+            report.performance = performance
             
-            self.db.add(performance)
+            self.db.add_all([report, performance])
             await self.db.commit()
             
             logger.info(f"Saved analysis report {report.id} for {stock_symbol}")
@@ -92,68 +143,80 @@ class ReportManagerService:
     
     async def get_user_reports(
         self,
-        user_id: str,
-        skip: int = 0,
+        user_id: uuid.UUID,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None,
         limit: int = 100,
         risk_level: Optional[RiskLevel] = None,
         timeframe: Optional[str] = None,
         stock_symbol: Optional[str] = None
-    ) -> List[AnalysisReport]:
+    ) -> Tuple[List[AnalysisReport], Optional[Tuple[datetime, uuid.UUID]]]:
         """
         Retrieve user's analysis reports with optional filtering.
         
+        Uses keyset pagination on (created_at, id), so each page costs
+        O(limit) regardless of how deep into the history it is. Performance
+        data is returned as stored; refresh_all_performance keeps it current.
+        
         Args:
             user_id: ID of the user
-            skip: Number of records to skip
+            cursor: (created_at, id) of the last report on the previous page
             limit: Maximum number of records to return
             risk_level: Filter by risk level
             timeframe: Filter by timeframe
             stock_symbol: Filter by stock symbol
             
         Returns:
-            List of AnalysisReport objects
+            Tuple of (AnalysisReport list, cursor for the next page or None)
         """
-        try:
-            query = select(AnalysisReport).where(
-                and_(
-                    AnalysisReport.user_id == uuid.UUID(user_id),
-                    AnalysisReport.is_active == True
+        # Built as a lambda statement so SQLAlchemy caches the compiled SQL
+        # for each combination of filters; closure values become bind params
+        query = lambda_stmt(lambda: select(AnalysisReport).where(
+            and_(
+                AnalysisReport.user_id == user_id,
+                AnalysisReport.is_active == True
+            )
+        ))
+        
+        # Apply filters
+        if risk_level:
+            query += lambda s: s.where(AnalysisReport.risk_level == risk_level)
+        
+        if timeframe:
+            query += lambda s: s.where(AnalysisReport.timeframe == timeframe)
+        
+        if stock_symbol:
+            symbol = stock_symbol.upper()
+            query += lambda s: s.where(AnalysisReport.stock_symbol == symbol)
+        
+        # Seek past the previous page
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            query += lambda s: s.where(
+                or_(
+                    AnalysisReport.created_at < cursor_created_at,
+                    and_(
+                        AnalysisReport.created_at == cursor_created_at,
+                        AnalysisReport.id < cursor_id
+                    )
                 )
             )
-            
-            # Apply filters
-            if risk_level:
-                query = query.where(AnalysisReport.risk_level == risk_level)
-            
-            if timeframe:
-                query = query.where(AnalysisReport.timeframe == timeframe)
-            
-            if stock_symbol:
-                query = query.where(AnalysisReport.stock_symbol == stock_symbol.upper())
-            
-            # Order by creation date (newest first)
-            query = query.order_by(desc(AnalysisReport.created_at))
-            
-            # Apply pagination
-            query = query.offset(skip).limit(limit)
-            
-            # Load performance tracking data
-            query = query.options(selectinload(AnalysisReport.performance_tracking))
-            
-            result = await self.db.execute(query)
-            reports = result.scalars().all()
-            
-            # Update performance data for each report
-            for report in reports:
-                await self._update_report_performance(report)
-            
-            return reports
-            
-        except Exception as e:
-            logger.error(f"Failed to get user reports: {str(e)}")
-            raise
+        
+        # Order by creation date (newest first), id breaks ties, then
+        # load performance tracking data; any other relationship access raises
+        query += lambda s: s.order_by(
+            desc(AnalysisReport.created_at), desc(AnalysisReport.id)
+        ).limit(limit).options(
+            selectinload(AnalysisReport.performance),
+            raiseload("*")
+        )
+        
+        result = await self.db.execute(query)
+        reports = result.scalars().all()
+        
+        next_cursor = (reports[-1].created_at, reports[-1].id) if len(reports) == limit else None
+        return reports, next_cursor
     
-    async def re_evaluate_report(self, report_id: str) -> Dict[str, Any]:
+    async def re_evaluate_report(self, report_id: uuid.UUID) -> Dict[str, Any]:
         """
         Re-evaluate a report by comparing original vs current data.
         
@@ -165,58 +228,26 @@ class ReportManagerService:
         """
         try:
             # Get the report with performance tracking
-            query = select(AnalysisReport).options(
-                selectinload(AnalysisReport.performance_tracking)
-            ).where(AnalysisReport.id == uuid.UUID(report_id))
+            result = await self.db.execute(self._report_detail_query(report_id))
+            row = result.one_or_none()
             
-            result = await self.db.execute(query)
-            report = result.scalar_one_or_none()
-            
-            if not report:
+            if not row:
                 raise ValueError(f"Report {report_id} not found")
             
+            # Age is measured against the database clock, so it is never stale
+            report, db_now, analysis_price = row
+            days_since_analysis = (db_now - report.created_at).days
+            
             # Get current stock price
             current_price = await self._get_current_stock_price(report.stock_symbol)
             
             # Get or create performance tracking record
-            performance = report.performance_tracking[0] if report.performance_tracking else None
-            
-            if not performance:
-                # Create new performance tracking record
-                performance = ReportPerformance(
-                    report_id=report.id,
-                    stock_symbol=report.stock_symbol,
-                    original_price=report.results.get('current_price', 0.0),
-                    current_price=current_price,
-                    performance_pct=0.0,
-                    predicted_return=report.results.get('predicted_return', 0.0),
-                    actual_return=0.0,
-                    accuracy_score=None,
-                    days_since_analysis=0
-                )
-                self.db.add(performance)
-            else:
-                # Update existing performance tracking
-                performance.current_price = current_price
-                performance.last_updated = datetime.utcnow()
-            
-            # Calculate performance metrics
+            performance = self._ensure_performance(report, analysis_price, current_price)
             original_price = performance.original_price
-            performance.performance_pct = ((current_price - original_price) / original_price) * 100
-            performance.actual_return = current_price - original_price
-            
-            # Calculate days since analysis
-            days_diff = (datetime.utcnow() - report.created_at).days
-            performance.days_since_analysis = days_diff
             
-            # Calculate accuracy score
+            # Calculate performance metrics
+            self._evaluate_performance(performance, current_price)
             predicted_return = performance.predicted_return or 0.0
-            if predicted_return != 0:
-                # Accuracy based on how close actual return is to predicted return
-                accuracy = 1.0 - abs(performance.performance_pct - predicted_return) / abs(predicted_return)
-                performance.accuracy_score = max(0.0, min(1.0, accuracy))
-            else:
-                performance.accuracy_score = 0.5  # Neutral score if no prediction
             
             await self.db.commit()
             
@@ -232,10 +263,10 @@ class ReportManagerService:
                 "predicted_return": predicted_return,
                 "actual_return": performance.actual_return,
                 "accuracy_score": performance.accuracy_score,
-                "days_since_analysis": days_diff,
-                "original_recommendation": report.results.get('recommendation'),
-                "original_confidence": report.results.get('confidence'),
-                "original_target_price": report.results.get('target_price'),
+                "days_since_analysis": days_since_analysis,
+                "original_recommendation": report.recommendation,
+                "original_confidence": report.confidence,
+                "original_target_price": report.target_price,
                 "performance_summary": self._generate_performance_summary(performance)
             }
             
@@ -247,7 +278,7 @@ class ReportManagerService:
             logger.error(f"Failed to re-evaluate report {report_id}: {str(e)}")
             raise
     
-    async def calculate_report_performance(self, report_id: str) -> Dict[str, Any]:
+    async def calculate_report_performance(self, report_id: uuid.UUID) -> Dict[str, Any]:
         """
         Calculate detailed performance metrics for a report.
         
@@ -257,63 +288,150 @@ class ReportManagerService:
         Returns:
             Dictionary with performance metrics
         """
-        try:
-            # Get the report with performance tracking
-            query = select(AnalysisReport).options(
-                selectinload(AnalysisReport.performance_tracking)
-            ).where(AnalysisReport.id == uuid.UUID(report_id))
-            
-            result = await self.db.execute(query)
-            report = result.scalar_one_or_none()
-            
-            if not report:
-                raise ValueError(f"Report {report_id} not found")
-            
-            performance = report.performance_tracking[0] if report.performance_tracking else None
-            
-            if not performance:
-                # Create performance tracking if it doesn't exist
-                await self.re_evaluate_report(report_id)
-                # Re-fetch the report
-                result = await self.db.execute(query)
-                report = result.scalar_one_or_none()
-                performance = report.performance_tracking[0]
-            
-            # Calculate additional performance metrics
-            performance_metrics = {
-                "report_id": str(report.id),
-                "stock_symbol": report.stock_symbol,
-                "analysis_date": report.created_at.isoformat(),
-                "last_updated": performance.last_updated.isoformat(),
-                "price_movement": {
-                    "original_price": performance.original_price,
-                    "current_price": performance.current_price,
-                    "price_change": performance.current_price - performance.original_price,
-                    "price_change_pct": performance.performance_pct
-                },
-                "return_analysis": {
-                    "predicted_return": performance.predicted_return,
-                    "actual_return": performance.actual_return,
-                    "return_difference": performance.actual_return - (performance.predicted_return or 0),
-                    "accuracy_score": performance.accuracy_score
-                },
-                "time_analysis": {
-                    "days_since_analysis": performance.days_since_analysis,
-                    "analysis_timeframe": report.timeframe,
-                    "risk_level": report.risk_level.value
-                },
-                "recommendation_accuracy": self._assess_recommendation_accuracy(report, performance),
-                "performance_grade": self._calculate_performance_grade(performance),
-                "benchmark_comparison": await self._get_benchmark_comparison(report.stock_symbol, report.created_at)
-            }
-            
-            return performance_metrics
-            
-        except Exception as e:
-            logger.error(f"Failed to calculate performance for report {report_id}: {str(e)}")
-            raise
+        # Get the report with performance tracking
+        result = await self.db.execute(self._report_detail_query(report_id))
+        row = result.one_or_none()
+        
+        if not row:
+            raise ValueError(f"Report {report_id} not found")
+        
+        # Age is measured against the database clock, so it is never stale
+        report, db_now, analysis_price = row
+        days_since_analysis = (db_now - report.created_at).days
+        
+        benchmark = self._get_benchmark_comparison(report.stock_symbol, report.created_at)
+        
+        performance = report.performance
+        if performance is None:
+            # Fetch the price alongside the benchmark, then create and
+            # evaluate performance tracking on the loaded report
+            current_price, benchmark_comparison = await asyncio.gather(
+                self._get_current_stock_price(report.stock_symbol),
+                benchmark
+            )
+            # The new record is already in the session, so any failure from
+            # here on must roll it back
+            try:
+                performance = self._ensure_performance(report, analysis_price, current_price)
+                self._evaluate_performance(performance, current_price)
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+        else:
+            benchmark_comparison = await benchmark
+        
+        # Calculate additional performance metrics
+        performance_metrics = {
+            "report_id": str(report.id),
+            "stock_symbol": report.stock_symbol,
+            "analysis_date": report.created_at.isoformat(),
+            "last_updated": performance.last_updated.isoformat(),
+            "price_movement": {
+                "original_price": performance.original_price,
+                "current_price": performance.current_price,
+                "price_change": performance.current_price - performance.original_price,
+                "price_change_pct": performance.performance_pct
+            },
+            "return_analysis": {
+                "predicted_return": performance.predicted_return,
+                "actual_return": performance.actual_return,
+                "return_difference": performance.actual_return - (performance.predicted_return or 0),
+                "accuracy_score": performance.accuracy_score
+            },
+            "time_analysis": {
+                "days_since_analysis": days_since_analysis,
+                "analysis_timeframe": report.timeframe,
+                "risk_level": report.risk_level.value
+            },
+            "recommendation_accuracy": self._assess_recommendation_accuracy(report, performance),
+            "performance_grade": self._calculate_performance_grade(performance),
+            "benchmark_comparison": benchmark_comparison
+        }
+        
+        return performance_metrics
+    
+    def _report_detail_query(self, report_id: uuid.UUID) -> Select:
+        """
+        Build the single-report query used for re-evaluation and metrics.
+        
+        Only the scalar columns those paths read are loaded, so the
+        parameters and results JSON blobs are never decoded. The one value
+        needed from results (the price at analysis time) is extracted in SQL.
+        """
+        return select(
+            AnalysisReport,
+            func.now().label("db_now"),
+            AnalysisReport.results['current_price'].as_float().label("analysis_price")
+        ).options(
+            load_only(
+                AnalysisReport.id,
+                AnalysisReport.stock_symbol,
+                AnalysisReport.created_at,
+                AnalysisReport.risk_level,
+                AnalysisReport.timeframe,
+                AnalysisReport.recommendation,
+                AnalysisReport.confidence,
+                AnalysisReport.predicted_return,
+                AnalysisReport.target_price,
+                raiseload=True
+            ),
+            joinedload(AnalysisReport.performance),
+            raiseload("*")
+        ).where(AnalysisReport.id == report_id)
+    
+    def _ensure_performance(
+        self,
+        report: AnalysisReport,
+        analysis_price: Optional[float],
+        current_price: float
+    ) -> ReportPerformance:
+        """Return the report's performance tracking record, creating it if missing."""
+        if report.performance is not None:
+            return report.performance
+        
+        performance = ReportPerformance(
+            report_id=report.id,
+            stock_symbol=report.stock_symbol,
+            original_price=analysis_price or 0.0,
+            current_price=current_price,
+            performance_pct=0.0,
+            predicted_return=report.predicted_return or 0.0,
+            actual_return=0.0,
+            accuracy_score=None
+        )
+        report.performance = performance
+        self.db.add(performance)
+        return performance
+    
+    def _evaluate_performance(self, performance: ReportPerformance, current_price: float) -> None:
+        """
+        Recalculate a performance record against the current price.
+        
+        Returns are relative to original_price, so without a positive one
+        (the price at analysis time was unknown) only the price is updated.
+        """
+        performance.current_price = current_price
+        performance.last_updated = datetime.utcnow()
+        
+        original_price = performance.original_price
+        if not original_price or original_price <= 0:
+            logger.warning(f"No original price for {performance.stock_symbol}; skipping return calculation")
+            return
+        
+        performance.performance_pct = ((current_price - original_price) / original_price) * 100
+        performance.actual_return = current_price - original_price
+        
+        # Calculate accuracy score
+        predicted_return = performance.predicted_return or 0.0
+        if predicted_return != 0:
+            # Accuracy based on how close actual return is to predicted return
+            accuracy = 1.0 - abs(performance.performance_pct - predicted_return) / abs(predicted_return)
+            performance.accuracy_score = max(0.0, min(1.0, accuracy))
+        else:
+            performance.accuracy_score = 0.5  # Neutral score if no prediction
     
-    async def get_performance_summary(self, user_id: str) -> Dict[str, Any]:
+    async def get_performance_summary(self, user_id: uuid.UUID) -> Dict[str, Any]:
         """
         Get overall performance summary for a user's reports.
         
@@ -323,151 +441,240 @@ class ReportManagerService:
         Returns:
             Dictionary with performance summary
         """
-        try:
-            # Get all user reports with performance data
-            query = select(AnalysisReport).options(
-                selectinload(AnalysisReport.performance_tracking)
-            ).where(
-                and_(
-                    AnalysisReport.user_id == uuid.UUID(user_id),
-                    AnalysisReport.is_active == True
-                )
-            )
-            
-            result = await self.db.execute(query)
-            reports = result.scalars().all()
-            
-            if not reports:
-                return {
-                    "total_reports": 0,
-                    "average_accuracy": 0.0,
-                    "total_performance": 0.0,
-                    "best_performer": None,
-                    "worst_performer": None,
-                    "recommendation_accuracy": {}
-                }
-            
-            # Calculate summary metrics
-            total_reports = len(reports)
-            accuracy_scores = []
-            performance_scores = []
-            best_performer = None
-            worst_performer = None
-            recommendation_stats = {}
-            
-            for report in reports:
-                if report.performance_tracking:
-                    performance = report.performance_tracking[0]
-                    
-                    if performance.accuracy_score is not None:
-                        accuracy_scores.append(performance.accuracy_score)
-                    
-                    performance_scores.append(performance.performance_pct)
-                    
-                    # Track best/worst performers
-                    if best_performer is None or performance.performance_pct > best_performer['performance']:
-                        best_performer = {
-                            'symbol': report.stock_symbol,
-                            'performance': performance.performance_pct,
-                            'report_id': str(report.id)
-                        }
-                    
-                    if worst_performer is None or performance.performance_pct < worst_performer['performance']:
-                        worst_performer = {
-                            'symbol': report.stock_symbol,
-                            'performance': performance.performance_pct,
-                            'report_id': str(report.id)
-                        }
-                    
-                    # Track recommendation accuracy
-                    recommendation = report.results.get('recommendation', 'hold')
-                    if recommendation not in recommendation_stats:
-                        recommendation_stats[recommendation] = {'total': 0, 'positive': 0}
-                    
-                    recommendation_stats[recommendation]['total'] += 1
-                    if performance.performance_pct > 0:
-                        recommendation_stats[recommendation]['positive'] += 1
-            
-            # Calculate averages
-            average_accuracy = sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0.0
-            total_performance = sum(performance_scores) / len(performance_scores) if performance_scores else 0.0
-            
-            # Calculate recommendation accuracy percentages
-            for rec in recommendation_stats:
-                total = recommendation_stats[rec]['total']
-                positive = recommendation_stats[rec]['positive']
-                recommendation_stats[rec]['accuracy'] = (positive / total * 100) if total > 0 else 0.0
-            
+        user_filter = and_(
+            AnalysisReport.user_id == user_id,
+            AnalysisReport.is_active == True
+        )
+        
+        # Totals and averages (avg skips reports without an accuracy score)
+        totals_query = select(
+            func.count(func.distinct(AnalysisReport.id)),
+            func.avg(ReportPerformance.accuracy_score),
+            func.avg(ReportPerformance.performance_pct)
+        ).select_from(AnalysisReport).outerjoin(ReportPerformance).where(user_filter)
+        
+        result = await self.db.execute(totals_query)
+        total_reports, average_accuracy, total_performance = result.one()
+        
+        if not total_reports:
             return {
-                "total_reports": total_reports,
-                "average_accuracy": average_accuracy,
-                "total_performance": total_performance,
-                "best_performer": best_performer,
-                "worst_performer": worst_performer,
-                "recommendation_accuracy": recommendation_stats,
-                "performance_distribution": self._calculate_performance_distribution(performance_scores)
+                "total_reports": 0,
+                "average_accuracy": 0.0,
+                "total_performance": 0.0,
+                "best_performer": None,
+                "worst_performer": None,
+                "recommendation_accuracy": {}
             }
-            
-        except Exception as e:
-            logger.error(f"Failed to get performance summary for user {user_id}: {str(e)}")
-            raise
+        
+        # Best/worst performers
+        performer_query = select(
+            AnalysisReport.stock_symbol,
+            AnalysisReport.id,
+            ReportPerformance.performance_pct
+        ).join(ReportPerformance).where(user_filter)
+        
+        result = await self.db.execute(
+            performer_query.order_by(desc(ReportPerformance.performance_pct)).limit(1)
+        )
+        best_performer = self._performer_from_row(result.first())
+        
+        result = await self.db.execute(
+            performer_query.order_by(ReportPerformance.performance_pct).limit(1)
+        )
+        worst_performer = self._performer_from_row(result.first())
+        
+        # Recommendation accuracy grouped in SQL
+        recommendation = func.coalesce(AnalysisReport.recommendation, 'hold').label('recommendation')
+        recommendation_query = select(
+            recommendation,
+            func.count(),
+            func.sum(case((ReportPerformance.performance_pct > 0, 1), else_=0))
+        ).join(ReportPerformance).where(user_filter).group_by(recommendation)
+        
+        result = await self.db.execute(recommendation_query)
+        recommendation_stats = {
+            rec: {
+                'total': total,
+                'positive': positive,
+                'accuracy': (positive / total * 100) if total > 0 else 0.0
+            }
+            for rec, total, positive in result.all()
+        }
+        
+        # Stream the performance column in batches so memory stays bounded
+        result = await self.db.stream(
+            select(ReportPerformance.performance_pct)
+            .join(AnalysisReport)
+            .where(user_filter)
+            .execution_options(yield_per=500)
+        )
+        bucket_counts = np.zeros(len(PERFORMANCE_BUCKETS), dtype=np.int64)
+        async for partition in result.scalars().partitions():
+            bucket_counts += self._count_performance_buckets(np.asarray(partition, dtype=np.float64))
+        
+        return {
+            "total_reports": total_reports,
+            "average_accuracy": average_accuracy or 0.0,
+            "total_performance": total_performance or 0.0,
+            "best_performer": best_performer,
+            "worst_performer": worst_performer,
+            "recommendation_accuracy": recommendation_stats,
+            "performance_distribution": dict(zip(PERFORMANCE_BUCKETS, bucket_counts.tolist()))
+        }
+    
+    def _performer_from_row(self, row: Optional[Any]) -> Optional[Dict[str, Any]]:
+        """Build a best/worst performer entry from a (symbol, id, performance) row."""
+        if row is None:
+            return None
+        
+        stock_symbol, report_id, performance_pct = row
+        return {
+            'symbol': stock_symbol,
+            'performance': performance_pct,
+            'report_id': str(report_id)
+        }
     
     async def _get_current_stock_price(self, stock_symbol: str) -> float:
-        """Get current stock price from market data service."""
+        """
+        Get current stock price, shared across requests for PRICE_CACHE_TTL.
+        
+        Concurrent callers for the same symbol wait on a single in-flight
+        fetch instead of each hitting the market data service.
+        """
+        symbol = stock_symbol.upper()
+        
+        while True:
+            price = _price_cache.get(symbol)
+            if price is not None:
+                return price
+            
+            inflight = _price_inflight.get(symbol)
+            if inflight is None:
+                break
+            await inflight.wait()
+        
+        event = _price_inflight[symbol] = asyncio.Event()
         try:
-            # This would integrate with your market data service
-            # For now, return a mock price
-            mock_prices = {
-                'CBA': 92.30,
-                'BHP': 39.80,
-                'WBC': 27.20,
-                'ANZ': 25.50,
-                'NAB': 28.90
-            }
-            return mock_prices.get(stock_symbol.upper(), 50.0)
+            price = await self._fetch_current_stock_price(symbol)
+            _price_cache[symbol] = price
+            return price
         except Exception as e:
             logger.error(f"Failed to get current price for {stock_symbol}: {str(e)}")
             return 0.0
+        finally:
+            del _price_inflight[symbol]
+            event.set()
+    
+    async def _fetch_current_stock_price(self, stock_symbol: str) -> float:
+        """Fetch current stock price from market data service."""
+        # This would integrate with your market data service
+        # For now, return a mock price
+        mock_prices = {
+            'CBA': 92.30,
+            'BHP': 39.80,
+            'WBC': 27.20,
+            'ANZ': 25.50,
+            'NAB': 28.90
+        }
+        return mock_prices.get(stock_symbol, 50.0)
+    
+    async def _get_current_stock_prices(self, stock_symbols: Iterable[str]) -> Dict[str, float]:
+        """Get current prices for many symbols, fetching each distinct symbol once."""
+        symbols = list({symbol.upper() for symbol in stock_symbols})
+        prices = await asyncio.gather(*(self._get_current_stock_price(symbol) for symbol in symbols))
+        return dict(zip(symbols, prices))
     
-    async def _update_report_performance(self, report: AnalysisReport) -> None:
-        """Update performance data for a report."""
+    async def refresh_all_performance(self) -> int:
+        """
+        Refresh performance tracking for every active report.
+        
+        Prices are fetched once per distinct symbol and applied with a single
+        executemany UPDATE keyed by symbol, then committed once. Rows whose
+        price has not moved materially (by less than a cent or one basis
+        point, whichever is larger) are left untouched, as are symbols whose
+        price could not be fetched.
+        
+        Returns:
+            Number of symbols whose current price was applied
+        """
+        active_reports = select(AnalysisReport.id).where(AnalysisReport.is_active == True)
+        
+        result = await self.db.execute(
+            select(ReportPerformance.stock_symbol)
+            .where(ReportPerformance.report_id.in_(active_reports))
+            .distinct()
+        )
+        symbols = result.scalars().all()
+        if not symbols:
+            return 0
+        
+        prices = await self._get_current_stock_prices(symbols)
+        
+        # A failed fetch reports a price of 0.0; applying it would record a
+        # -100% return, so those symbols keep their last known price
+        params = [
+            {
+                "symbol": symbol,
+                "price": prices[symbol.upper()],
+                "tolerance": max(0.01, abs(prices[symbol.upper()]) * 1e-4)
+            }
+            for symbol in symbols
+            if prices[symbol.upper()] > 0
+        ]
+        if len(params) < len(symbols):
+            logger.warning(f"Skipping performance refresh for {len(symbols) - len(params)} symbols without a current price")
+        if not params:
+            return 0
+        
+        # SET expressions read the pre-update row, so everything is derived
+        # from original_price and the new price
+        price = bindparam("price")
+        performance_pct = (price - ReportPerformance.original_price) / ReportPerformance.original_price * 100
+        accuracy = 1.0 - func.abs(performance_pct - ReportPerformance.predicted_return) / func.abs(ReportPerformance.predicted_return)
+        
+        statement = (
+            update(ReportPerformance.__table__)
+            .where(
+                ReportPerformance.stock_symbol == bindparam("symbol"),
+                ReportPerformance.report_id.in_(active_reports),
+                ReportPerformance.original_price > 0,
+                func.abs(ReportPerformance.current_price - price) >= bindparam("tolerance")
+            )
+            .values(
+                current_price=price,
+                performance_pct=performance_pct,
+                actual_return=price - ReportPerformance.original_price,
+                accuracy_score=case(
+                    (func.coalesce(ReportPerformance.predicted_return, 0.0) == 0.0, ReportPerformance.accuracy_score),
+                    (accuracy < 0.0, 0.0),
+                    (accuracy > 1.0, 1.0),
+                    else_=accuracy
+                ),
+                last_updated=func.now()
+            )
+        )
+        
         try:
-            if not report.performance_tracking:
-                return
-            
-            performance = report.performance_tracking[0]
-            current_price = await self._get_current_stock_price(report.stock_symbol)
-            
-            if current_price != performance.current_price:
-                performance.current_price = current_price
-                performance.performance_pct = ((current_price - performance.original_price) / performance.original_price) * 100
-                performance.actual_return = current_price - performance.original_price
-                performance.last_updated = datetime.utcnow()
-                
-                # Recalculate accuracy score
-                if performance.predicted_return:
-                    accuracy = 1.0 - abs(performance.performance_pct - performance.predicted_return) / abs(performance.predicted_return)
-                    performance.accuracy_score = max(0.0, min(1.0, accuracy))
-                
-                await self.db.commit()
-                
-        except Exception as e:
-            logger.error(f"Failed to update performance for report {report.id}: {str(e)}")
+            await self.db.execute(statement, params)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        # executemany rowcounts are unreliable (async drivers may report -1),
+        # so report the symbols refreshed rather than rows changed
+        logger.info(f"Refreshed performance for {len(params)} of {len(symbols)} symbols")
+        return len(params)
     
-    def _generate_performance_summary(self, performance: ReportPerformance) -> str:
+    @staticmethod
+    def _generate_performance_summary(performance: ReportPerformance) -> str:
         """Generate a human-readable performance summary."""
-        if performance.performance_pct > 5:
-            return "Strong positive performance"
-        elif performance.performance_pct > 0:
-            return "Positive performance"
-        elif performance.performance_pct > -5:
-            return "Neutral performance"
-        else:
-            return "Negative performance"
+        # bisect_left: a score exactly on an edge falls in the lower band
+        return PERFORMANCE_SUMMARIES[bisect.bisect_left(PERFORMANCE_SUMMARY_EDGES, performance.performance_pct)]
     
     def _assess_recommendation_accuracy(self, report: AnalysisReport, performance: ReportPerformance) -> Dict[str, Any]:
         """Assess how accurate the original recommendation was."""
-        recommendation = report.results.get('recommendation', 'hold')
+        recommendation = report.recommendation or 'hold'
         performance_pct = performance.performance_pct
         
         # Define what constitutes "correct" for each recommendation
@@ -483,24 +690,17 @@ class ReportManagerService:
             "recommendation": recommendation,
             "was_correct": correct,
             "performance": performance_pct,
-            "confidence": report.results.get('confidence', 0.0)
+            "confidence": report.confidence or 0.0
         }
     
-    def _calculate_performance_grade(self, performance: ReportPerformance) -> str:
+    @staticmethod
+    def _calculate_performance_grade(performance: ReportPerformance) -> str:
         """Calculate a letter grade for the performance."""
         if performance.accuracy_score is None:
             return "N/A"
         
-        if performance.accuracy_score >= 0.8:
-            return "A"
-        elif performance.accuracy_score >= 0.7:
-            return "B"
-        elif performance.accuracy_score >= 0.6:
-            return "C"
-        elif performance.accuracy_score >= 0.5:
-            return "D"
-        else:
-            return "F"
+        # bisect_right: a score exactly on an edge earns the higher grade
+        return PERFORMANCE_GRADES[bisect.bisect_right(PERFORMANCE_GRADE_EDGES, performance.accuracy_score)]
     
     async def _get_benchmark_comparison(self, stock_symbol: str, analysis_date: datetime) -> Dict[str, Any]:
         """Compare performance against market benchmark."""
@@ -512,26 +712,25 @@ class ReportManagerService:
             "benchmark_name": "ASX 200"
         }
     
-    def _calculate_performance_distribution(self, performance_scores: List[float]) -> Dict[str, int]:
-        """Calculate distribution of performance scores."""
-        distribution = {
-            "excellent": 0,  # > 10%
-            "good": 0,       # 5-10%
-            "neutral": 0,    # -5 to 5%
-            "poor": 0,       # -10 to -5%
-            "terrible": 0    # < -10%
-        }
-        
-        for score in performance_scores:
-            if score > 10:
-                distribution["excellent"] += 1
-            elif score > 5:
-                distribution["good"] += 1
-            elif score > -5:
-                distribution["neutral"] += 1
-            elif score > -10:
-                distribution["poor"] += 1
-            else:
-                distribution["terrible"] += 1
-        
-        return distribution
+    def _count_performance_buckets(self, performance_scores: np.ndarray) -> np.ndarray:
+        """Count performance scores per PERFORMANCE_BUCKETS entry."""
+        # side='left' counts edges strictly below each score, so a bucket
+        # includes its upper edge (e.g. exactly 10% is "good")
+        buckets = np.searchsorted(PERFORMANCE_BUCKET_EDGES, performance_scores, side='left')
+        return np.bincount(buckets, minlength=len(PERFORMANCE_BUCKETS))
+
+
+async def refresh_performance_periodically(
+    session_factory: Callable[[], AsyncSession],
+    interval_seconds: float
+) -> None:
+    """Background loop that refreshes report performance every interval."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with session_factory() as session:
+                await ReportManagerService(session).refresh_all_performance()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scheduled performance refresh failed: {str(e)}")
@@ -1,65 +1,159 @@
-import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from app.services.fast_indicators import (
+    batch_ewma,
+    batch_rolling_mean_std,
+    batch_sma,
+    batch_stochastic,
+    ewma,
+    macd,
+    multi_ewma,
+    multi_sma,
+    rolling_mean_std,
+    stochastic
+)
+from app.services.incremental import STATE_CLASSES
+
 logger = logging.getLogger(__name__)
 
+# Moving averages already computed for one price history, keyed by
+# (kind, period) such as ('ema', 12), so indicators can share them
+IndicatorCache = Dict[Tuple[str, int], np.ndarray]
+
 
 class TechnicalAnalysisService:
     """
     Service for calculating technical indicators from price data.
-    Uses pandas for efficient calculations.
+    Works on contiguous float64 NumPy arrays with Numba-compiled kernels.
     """
     
     @staticmethod
-    def calculate_rsi(prices: List[float], period: int = 14) -> List[Optional[float]]:
+    def _moving_averages(
+        kind: str,
+        close: np.ndarray,
+        periods: List[int],
+        cache: Optional[IndicatorCache] = None
+    ) -> Dict[int, np.ndarray]:
+        """
+        Get 'sma' or 'ema' series for several periods, reusing cached ones.
+        
+        Missing periods are computed together by one kernel that runs them
+        in parallel, and stored in the cache when one is given.
+        """
+        found = {}
+        missing = []
+        for period in dict.fromkeys(periods):
+            if cache is not None and (kind, period) in cache:
+                found[period] = cache[(kind, period)]
+            else:
+                missing.append(period)
+        
+        if missing:
+            rows = multi_sma(close, missing) if kind == 'sma' else multi_ewma(close, missing)
+            for period, row in zip(missing, rows):
+                found[period] = row
+                if cache is not None:
+                    cache[(kind, period)] = row
+        
+        return found
+    
+    @staticmethod
+    def _to_optional_list(values: np.ndarray, decimals: int) -> List[Optional[float]]:
+        """
+        Round a series and convert it to a list, with None in place of NaN.
+        
+        A 2-D array of series becomes a list of lists, converted in one go.
+        """
+        rounded = np.round(values, decimals)
+        result = rounded.astype(object)
+        result[np.isnan(rounded)] = None
+        return result.tolist()
+    
+    @staticmethod
+    def _output(values: np.ndarray, decimals: int, as_numpy: bool = False) -> Any:
+        """Return a series as the array itself, or as a rounded list with None for NaN."""
+        return values if as_numpy else TechnicalAnalysisService._to_optional_list(values, decimals)
+    
+    @staticmethod
+    def _empty_series(n: int, as_numpy: bool = False) -> Any:
+        """Return an all-missing series of length n."""
+        return np.full(n, np.nan) if as_numpy else [None] * n
+    
+    @staticmethod
+    def _validated(prices: List[float], min_length: int, name: str) -> Optional[np.ndarray]:
+        """
+        Convert prices to a contiguous float64 array, checking them up front.
+        
+        Returns None, after logging why, when there are fewer than min_length
+        prices or any price is not a finite number; the indicator kernels
+        can then run without per-call error handling.
+        """
+        if len(prices) < min_length:
+            logger.warning(f"Insufficient data for {name}. Need {min_length}, got {len(prices)}")
+            return None
+        
+        try:
+            close = np.ascontiguousarray(prices, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid prices for {name}: {str(e)}")
+            return None
+        
+        if close.ndim != 1 or not np.isfinite(close).all():
+            logger.warning(f"Invalid prices for {name}: expected a series of finite numbers")
+            return None
+        return close
+    
+    @staticmethod
+    def calculate_rsi(prices: List[float], period: int = 14, as_numpy: bool = False) -> List[Optional[float]]:
         """
         Calculate Relative Strength Index (RSI).
         
         Args:
             prices: List of closing prices
             period: RSI period (default 14)
+            as_numpy: Return a float64 array with NaN instead of a list
             
         Returns:
             List of RSI values (None for insufficient data)
         """
+        close = TechnicalAnalysisService._validated(prices, period + 1, "RSI calculation")
+        if close is None:
+            return TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+        
         try:
-            if len(prices) < period + 1:
-                logger.warning(f"Insufficient data for RSI calculation. Need {period + 1}, got {len(prices)}")
-                return [None] * len(prices)
-            
-            df = pd.DataFrame({'close': prices})
-            
             # Calculate price changes
-            delta = df['close'].diff()
+            delta = np.diff(close, prepend=close[0])
             
             # Separate gains and losses
-            gains = delta.where(delta > 0, 0)
-            losses = -delta.where(delta < 0, 0)
+            gains = np.where(delta > 0, delta, 0.0)
+            losses = np.where(delta < 0, -delta, 0.0)
             
             # Calculate average gains and losses using exponential moving average
-            avg_gains = gains.ewm(span=period, adjust=False).mean()
-            avg_losses = losses.ewm(span=period, adjust=False).mean()
+            avg_gains = ewma(gains, period)
+            avg_losses = ewma(losses, period)
             
-            # Calculate RS and RSI
-            rs = avg_gains / avg_losses
-            rsi = 100 - (100 / (1 + rs))
+            # Calculate RS and RSI (0/0 on a flat start is left as NaN)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = avg_gains / avg_losses
+                rsi = 100 - (100 / (1 + rs))
             
             # Convert to list, replacing NaN with None
-            rsi_values = rsi.tolist()
-            return [None if pd.isna(val) else round(float(val), 2) for val in rsi_values]
+            return TechnicalAnalysisService._output(rsi, 2, as_numpy)
             
         except Exception as e:
             logger.error(f"Error calculating RSI: {str(e)}")
-            return [None] * len(prices)
+            return TechnicalAnalysisService._empty_series(len(prices), as_numpy)
     
     @staticmethod
     def calculate_macd(
         prices: List[float], 
         fast_period: int = 12, 
         slow_period: int = 26, 
-        signal_period: int = 9
+        signal_period: int = 9,
+        cache: Optional[IndicatorCache] = None,
+        as_numpy: bool = False
     ) -> Dict[str, List[Optional[float]]]:
         """
         Calculate MACD (Moving Average Convergence Divergence).
@@ -69,50 +163,51 @@ class TechnicalAnalysisService:
             fast_period: Fast EMA period (default 12)
             slow_period: Slow EMA period (default 26)
             signal_period: Signal line EMA period (default 9)
+            cache: Optional moving averages shared with other indicators
+            as_numpy: Return float64 arrays with NaN instead of lists
             
         Returns:
             Dict with 'macd', 'signal', and 'histogram' lists
         """
+        close = TechnicalAnalysisService._validated(prices, slow_period, "MACD calculation")
+        if close is None:
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+            return {'macd': empty_list, 'signal': empty_list, 'histogram': empty_list}
+        
         try:
-            if len(prices) < slow_period:
-                logger.warning(f"Insufficient data for MACD calculation. Need {slow_period}, got {len(prices)}")
-                empty_list = [None] * len(prices)
-                return {'macd': empty_list, 'signal': empty_list, 'histogram': empty_list}
-            
-            df = pd.DataFrame({'close': prices})
-            
-            # Calculate EMAs
-            ema_fast = df['close'].ewm(span=fast_period, adjust=False).mean()
-            ema_slow = df['close'].ewm(span=slow_period, adjust=False).mean()
-            
-            # Calculate MACD line
-            macd_line = ema_fast - ema_slow
-            
-            # Calculate signal line
-            signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-            
-            # Calculate histogram
-            histogram = macd_line - signal_line
+            if cache is not None and ('ema', fast_period) in cache and ('ema', slow_period) in cache:
+                # Reuse the cached EMAs for the MACD line
+                macd_line = cache[('ema', fast_period)] - cache[('ema', slow_period)]
+                signal_line = ewma(macd_line, signal_period)
+                histogram = macd_line - signal_line
+            else:
+                # Calculate all three lines in one pass over the prices; the
+                # EMAs it runs on are kept for the moving averages
+                macd_line, signal_line, histogram, ema_fast, ema_slow = macd(
+                    close, fast_period, slow_period, signal_period
+                )
+                if cache is not None:
+                    cache[('ema', fast_period)] = ema_fast
+                    cache[('ema', slow_period)] = ema_slow
             
             # Convert to lists, replacing NaN with None
-            def clean_values(series):
-                return [None if pd.isna(val) else round(float(val), 4) for val in series.tolist()]
-            
             return {
-                'macd': clean_values(macd_line),
-                'signal': clean_values(signal_line),
-                'histogram': clean_values(histogram)
+                'macd': TechnicalAnalysisService._output(macd_line, 4, as_numpy),
+                'signal': TechnicalAnalysisService._output(signal_line, 4, as_numpy),
+                'histogram': TechnicalAnalysisService._output(histogram, 4, as_numpy)
             }
             
         except Exception as e:
             logger.error(f"Error calculating MACD: {str(e)}")
-            empty_list = [None] * len(prices)
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
             return {'macd': empty_list, 'signal': empty_list, 'histogram': empty_list}
     
     @staticmethod
     def calculate_moving_averages(
         prices: List[float], 
-        periods: List[int] = [5, 10, 20, 50, 200]
+        periods: List[int] = [5, 10, 20, 50, 200],
+        cache: Optional[IndicatorCache] = None,
+        as_numpy: bool = False
     ) -> Dict[str, List[Optional[float]]]:
         """
         Calculate Simple Moving Averages (SMA).
@@ -120,35 +215,51 @@ class TechnicalAnalysisService:
         Args:
             prices: List of closing prices
             periods: List of periods for moving averages
+            cache: Optional moving averages shared with other indicators
+            as_numpy: Return float64 arrays with NaN instead of lists
             
         Returns:
             Dict with moving averages for each period
         """
+        if len(prices) == 0:
+            return {}
+        
+        close = TechnicalAnalysisService._validated(prices, 1, "moving averages")
+        if close is None:
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+            return {f'sma_{period}': empty_list for period in periods}
+        
         try:
-            if not prices:
-                return {}
-            
-            df = pd.DataFrame({'close': prices})
+            n = len(close)
             result = {}
             
+            # Periods longer than the series share one all-None list
+            empty_list = TechnicalAnalysisService._empty_series(n, as_numpy) if n < max(periods, default=0) else None
+            
+            averages = TechnicalAnalysisService._moving_averages(
+                'sma', close, [period for period in periods if period <= n], cache
+            )
+            
             for period in periods:
-                if len(prices) < period:
-                    logger.warning(f"Insufficient data for {period}-period SMA. Need {period}, got {len(prices)}")
-                    result[f'sma_{period}'] = [None] * len(prices)
+                if n < period:
+                    logger.warning(f"Insufficient data for {period}-period SMA. Need {period}, got {n}")
+                    result[f'sma_{period}'] = empty_list
                 else:
-                    sma = df['close'].rolling(window=period).mean()
-                    result[f'sma_{period}'] = [None if pd.isna(val) else round(float(val), 2) for val in sma.tolist()]
+                    result[f'sma_{period}'] = TechnicalAnalysisService._output(averages[period], 2, as_numpy)
             
             return result
             
         except Exception as e:
             logger.error(f"Error calculating moving averages: {str(e)}")
-            return {f'sma_{period}': [None] * len(prices) for period in periods}
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+            return {f'sma_{period}': empty_list for period in periods}
     
     @staticmethod
     def calculate_exponential_moving_averages(
         prices: List[float], 
-        periods: List[int] = [12, 26, 50]
+        periods: List[int] = [12, 26, 50],
+        cache: Optional[IndicatorCache] = None,
+        as_numpy: bool = False
     ) -> Dict[str, List[Optional[float]]]:
         """
         Calculate Exponential Moving Averages (EMA).
@@ -156,36 +267,52 @@ class TechnicalAnalysisService:
         Args:
             prices: List of closing prices
             periods: List of periods for EMAs
+            cache: Optional moving averages shared with other indicators
+            as_numpy: Return float64 arrays with NaN instead of lists
             
         Returns:
             Dict with EMAs for each period
         """
+        if len(prices) == 0:
+            return {}
+        
+        close = TechnicalAnalysisService._validated(prices, 1, "exponential moving averages")
+        if close is None:
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+            return {f'ema_{period}': empty_list for period in periods}
+        
         try:
-            if not prices:
-                return {}
-            
-            df = pd.DataFrame({'close': prices})
+            n = len(close)
             result = {}
             
+            # Periods longer than the series share one all-None list
+            empty_list = TechnicalAnalysisService._empty_series(n, as_numpy) if n < max(periods, default=0) else None
+            
+            averages = TechnicalAnalysisService._moving_averages(
+                'ema', close, [period for period in periods if period <= n], cache
+            )
+            
             for period in periods:
-                if len(prices) < period:
-                    logger.warning(f"Insufficient data for {period}-period EMA. Need {period}, got {len(prices)}")
-                    result[f'ema_{period}'] = [None] * len(prices)
+                if n < period:
+                    logger.warning(f"Insufficient data for {period}-period EMA. Need {period}, got {n}")
+                    result[f'ema_{period}'] = empty_list
                 else:
-                    ema = df['close'].ewm(span=period, adjust=False).mean()
-                    result[f'ema_{period}'] = [None if pd.isna(val) else round(float(val), 2) for val in ema.tolist()]
+                    result[f'ema_{period}'] = TechnicalAnalysisService._output(averages[period], 2, as_numpy)
             
             return result
             
         except Exception as e:
             logger.error(f"Error calculating exponential moving averages: {str(e)}")
-            return {f'ema_{period}': [None] * len(prices) for period in periods}
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+            return {f'ema_{period}': empty_list for period in periods}
     
     @staticmethod
     def calculate_bollinger_bands(
         prices: List[float], 
         period: int = 20, 
-        std_dev: float = 2.0
+        std_dev: float = 2.0,
+        cache: Optional[IndicatorCache] = None,
+        as_numpy: bool = False
     ) -> Dict[str, List[Optional[float]]]:
         """
         Calculate Bollinger Bands.
@@ -194,40 +321,36 @@ class TechnicalAnalysisService:
             prices: List of closing prices
             period: Moving average period (default 20)
             std_dev: Standard deviation multiplier (default 2.0)
+            cache: Optional moving averages shared with other indicators
+            as_numpy: Return float64 arrays with NaN instead of lists
             
         Returns:
             Dict with 'upper', 'middle', and 'lower' bands
         """
+        close = TechnicalAnalysisService._validated(prices, period, "Bollinger Bands")
+        if close is None:
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
+            return {'upper': empty_list, 'middle': empty_list, 'lower': empty_list}
+        
         try:
-            if len(prices) < period:
-                logger.warning(f"Insufficient data for Bollinger Bands. Need {period}, got {len(prices)}")
-                empty_list = [None] * len(prices)
-                return {'upper': empty_list, 'middle': empty_list, 'lower': empty_list}
-            
-            df = pd.DataFrame({'close': prices})
-            
-            # Calculate middle band (SMA)
-            middle_band = df['close'].rolling(window=period).mean()
-            
-            # Calculate standard deviation
-            std = df['close'].rolling(window=period).std()
+            # Calculate middle band (SMA) and standard deviation in one pass
+            middle_band, std = rolling_mean_std(close, period)
+            if cache is not None:
+                cache.setdefault(('sma', period), middle_band)
             
             # Calculate upper and lower bands
             upper_band = middle_band + (std * std_dev)
             lower_band = middle_band - (std * std_dev)
             
-            def clean_values(series):
-                return [None if pd.isna(val) else round(float(val), 2) for val in series.tolist()]
-            
             return {
-                'upper': clean_values(upper_band),
-                'middle': clean_values(middle_band),
-                'lower': clean_values(lower_band)
+                'upper': TechnicalAnalysisService._output(upper_band, 2, as_numpy),
+                'middle': TechnicalAnalysisService._output(middle_band, 2, as_numpy),
+                'lower': TechnicalAnalysisService._output(lower_band, 2, as_numpy)
             }
             
         except Exception as e:
             logger.error(f"Error calculating Bollinger Bands: {str(e)}")
-            empty_list = [None] * len(prices)
+            empty_list = TechnicalAnalysisService._empty_series(len(prices), as_numpy)
             return {'upper': empty_list, 'middle': empty_list, 'lower': empty_list}
     
     @staticmethod
@@ -236,7 +359,8 @@ class TechnicalAnalysisService:
         low: List[float], 
         close: List[float], 
         k_period: int = 14, 
-        d_period: int = 3
+        d_period: int = 3,
+        as_numpy: bool = False
     ) -> Dict[str, List[Optional[float]]]:
         """
         Calculate Stochastic Oscillator.
@@ -247,48 +371,38 @@ class TechnicalAnalysisService:
             close: List of closing prices
             k_period: %K period (default 14)
             d_period: %D period (default 3)
+            as_numpy: Return float64 arrays with NaN instead of lists
             
         Returns:
             Dict with '%K' and '%D' values
         """
+        closes = TechnicalAnalysisService._validated(close, k_period, "Stochastic")
+        highs = TechnicalAnalysisService._validated(high, k_period, "Stochastic")
+        lows = TechnicalAnalysisService._validated(low, k_period, "Stochastic")
+        if closes is None or highs is None or lows is None or not len(highs) == len(lows) == len(closes):
+            empty_list = TechnicalAnalysisService._empty_series(len(close), as_numpy)
+            return {'k_percent': empty_list, 'd_percent': empty_list}
+        
         try:
-            if len(close) < k_period:
-                logger.warning(f"Insufficient data for Stochastic. Need {k_period}, got {len(close)}")
-                empty_list = [None] * len(close)
-                return {'k_percent': empty_list, 'd_percent': empty_list}
-            
-            df = pd.DataFrame({
-                'high': high,
-                'low': low,
-                'close': close
-            })
-            
-            # Calculate %K
-            lowest_low = df['low'].rolling(window=k_period).min()
-            highest_high = df['high'].rolling(window=k_period).max()
-            k_percent = 100 * ((df['close'] - lowest_low) / (highest_high - lowest_low))
-            
-            # Calculate %D (SMA of %K)
-            d_percent = k_percent.rolling(window=d_period).mean()
-            
-            def clean_values(series):
-                return [None if pd.isna(val) else round(float(val), 2) for val in series.tolist()]
+            # Calculate %K and %D (SMA of %K) in one pass
+            k_percent, d_percent = stochastic(highs, lows, closes, k_period, d_period)
             
             return {
-                'k_percent': clean_values(k_percent),
-                'd_percent': clean_values(d_percent)
+                'k_percent': TechnicalAnalysisService._output(k_percent, 2, as_numpy),
+                'd_percent': TechnicalAnalysisService._output(d_percent, 2, as_numpy)
             }
             
         except Exception as e:
             logger.error(f"Error calculating Stochastic: {str(e)}")
-            empty_list = [None] * len(close)
+            empty_list = TechnicalAnalysisService._empty_series(len(close), as_numpy)
             return {'k_percent': empty_list, 'd_percent': empty_list}
     
     @staticmethod
     def calculate_all_indicators(
         prices: List[float], 
         high: Optional[List[float]] = None, 
-        low: Optional[List[float]] = None
+        low: Optional[List[float]] = None,
+        as_numpy: bool = False
     ) -> Dict[str, Any]:
         """
         Calculate all technical indicators for given price data.
@@ -297,22 +411,46 @@ class TechnicalAnalysisService:
             prices: List of closing prices
             high: Optional list of high prices
             low: Optional list of low prices
+            as_numpy: Return float64 arrays with NaN instead of lists
             
         Returns:
             Dict containing all calculated indicators
         """
         try:
+            n = len(prices)
+            
+            # Indicators whose default period needs more bars than there are
+            # are not dispatched; they all share one all-None list
+            empty_list = TechnicalAnalysisService._empty_series(n, as_numpy)
+            
+            # Convert once and share moving averages between indicators:
+            # the 20-period SMA reuses the Bollinger middle band, so it is
+            # computed first, and the 12- and 26-period EMAs reuse the ones
+            # MACD runs on, so MACD comes before the EMAs
+            close = np.ascontiguousarray(prices, dtype=np.float64)
+            cache: IndicatorCache = {}
+            if n >= 20:
+                bollinger_bands = TechnicalAnalysisService.calculate_bollinger_bands(close, cache=cache, as_numpy=as_numpy)
+            else:
+                bollinger_bands = {'upper': empty_list, 'middle': empty_list, 'lower': empty_list}
+            
             result = {
-                'rsi': TechnicalAnalysisService.calculate_rsi(prices),
-                'macd': TechnicalAnalysisService.calculate_macd(prices),
-                'sma': TechnicalAnalysisService.calculate_moving_averages(prices),
-                'ema': TechnicalAnalysisService.calculate_exponential_moving_averages(prices),
-                'bollinger_bands': TechnicalAnalysisService.calculate_bollinger_bands(prices)
+                'rsi': TechnicalAnalysisService.calculate_rsi(close, as_numpy=as_numpy) if n > 14 else empty_list,
+                'macd': (
+                    TechnicalAnalysisService.calculate_macd(close, cache=cache, as_numpy=as_numpy) if n >= 26
+                    else {'macd': empty_list, 'signal': empty_list, 'histogram': empty_list}
+                ),
+                'sma': TechnicalAnalysisService.calculate_moving_averages(close, cache=cache, as_numpy=as_numpy),
+                'ema': TechnicalAnalysisService.calculate_exponential_moving_averages(close, cache=cache, as_numpy=as_numpy),
+                'bollinger_bands': bollinger_bands
             }
             
             # Add stochastic if high and low prices are provided
-            if high and low and len(high) == len(prices) and len(low) == len(prices):
-                result['stochastic'] = TechnicalAnalysisService.calculate_stochastic(high, low, prices)
+            if high and low and len(high) == n and len(low) == n:
+                if n >= 14:
+                    result['stochastic'] = TechnicalAnalysisService.calculate_stochastic(high, low, close, as_numpy=as_numpy)
+                else:
+                    result['stochastic'] = {'k_percent': empty_list, 'd_percent': empty_list}
             
             return result
             
@@ -320,6 +458,189 @@ class TechnicalAnalysisService:
             logger.error(f"Error calculating all indicators: {str(e)}")
             return {}
     
+    @staticmethod
+    def calculate_batch(
+        prices_matrix: np.ndarray,
+        highs: Optional[np.ndarray] = None,
+        lows: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate all technical indicators for many symbols at once.
+        
+        Every symbol must cover the same bars. Each indicator is computed for
+        all symbols in one kernel call that runs the symbols in parallel,
+        with the same default periods as calculate_all_indicators.
+        
+        The batch kernels are compiled with fastmath, which assumes finite
+        inputs, so symbols with a NaN or infinite price are not passed to
+        them and get an empty dict instead.
+        
+        Args:
+            prices_matrix: Closing prices, shape (n_symbols, n_bars)
+            highs: Optional high prices, same shape
+            lows: Optional low prices, same shape
+            
+        Returns:
+            List with one calculate_all_indicators-style dict per symbol
+        """
+        try:
+            closes = np.ascontiguousarray(prices_matrix, dtype=np.float64)
+            if closes.ndim != 2:
+                raise ValueError(f"prices_matrix must be 2-D, got shape {closes.shape}")
+            
+            finite = np.isfinite(closes).all(axis=1)
+            if highs is not None and lows is not None:
+                highs = np.ascontiguousarray(highs, dtype=np.float64)
+                lows = np.ascontiguousarray(lows, dtype=np.float64)
+                if highs.shape != closes.shape or lows.shape != closes.shape:
+                    raise ValueError(
+                        f"highs {highs.shape} and lows {lows.shape} must match prices_matrix {closes.shape}"
+                    )
+                finite &= np.isfinite(highs).all(axis=1) & np.isfinite(lows).all(axis=1)
+            
+            if not finite.all():
+                logger.warning(f"Skipping {int((~finite).sum())} symbols with NaN or infinite prices")
+                computed = iter(TechnicalAnalysisService.calculate_batch(
+                    closes[finite],
+                    highs[finite] if highs is not None and lows is not None else None,
+                    lows[finite] if highs is not None and lows is not None else None
+                ))
+                return [next(computed) if ok else {} for ok in finite]
+            
+            n_symbols, n = closes.shape
+            
+            # Indicators needing more bars than there are share one all-None list
+            empty_list = [None] * n
+            to_list = TechnicalAnalysisService._to_optional_list
+            
+            rsi = macd_line = signal_line = None
+            if n > 14:
+                delta = np.diff(closes, axis=1, prepend=closes[:, :1])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rs = batch_ewma(np.where(delta > 0, delta, 0.0), 14) / batch_ewma(np.where(delta < 0, -delta, 0.0), 14)
+                    rsi = 100 - (100 / (1 + rs))
+            
+            ema_periods = [period for period in (12, 26, 50) if period <= n]
+            emas = {period: batch_ewma(closes, period) for period in ema_periods}
+            if n >= 26:
+                macd_line = emas[12] - emas[26]
+                signal_line = batch_ewma(macd_line, 9)
+            
+            # As in calculate_all_indicators, the 20-period SMA is the
+            # Bollinger middle band
+            bands = None
+            smas = {}
+            if n >= 20:
+                middle_band, std = batch_rolling_mean_std(closes, 20)
+                bands = (middle_band + std * 2.0, middle_band, middle_band - std * 2.0)
+                smas[20] = middle_band
+            
+            sma_periods = [period for period in (5, 10, 50, 200) if period <= n]
+            smas.update(zip(sma_periods, np.moveaxis(batch_sma(closes, sma_periods), 1, 0)))
+            
+            stochastic_values = None
+            if highs is not None and lows is not None and n >= 14:
+                stochastic_values = batch_stochastic(highs, lows, closes, 14, 3)
+            
+            # Convert each indicator for all symbols at once, one row per symbol
+            if rsi is not None:
+                rsi = to_list(rsi, 2)
+            smas = {period: to_list(values, 2) for period, values in smas.items()}
+            emas = {period: to_list(values, 2) for period, values in emas.items()}
+            if macd_line is not None:
+                macd_rows = (to_list(macd_line, 4), to_list(signal_line, 4), to_list(macd_line - signal_line, 4))
+            if bands is not None:
+                bands = tuple(to_list(band, 2) for band in bands)
+            if stochastic_values is not None:
+                stochastic_values = tuple(to_list(values, 2) for values in stochastic_values)
+            
+            results = []
+            for s in range(n_symbols):
+                result = {
+                    'rsi': rsi[s] if rsi is not None else empty_list,
+                    'macd': {'macd': empty_list, 'signal': empty_list, 'histogram': empty_list},
+                    'sma': {} if n == 0 else {
+                        f'sma_{period}': smas[period][s] if period in smas else empty_list
+                        for period in (5, 10, 20, 50, 200)
+                    },
+                    'ema': {} if n == 0 else {
+                        f'ema_{period}': emas[period][s] if period in emas else empty_list
+                        for period in (12, 26, 50)
+                    },
+                    'bollinger_bands': {'upper': empty_list, 'middle': empty_list, 'lower': empty_list}
+                }
+                
+                if macd_line is not None:
+                    result['macd'] = {
+                        'macd': macd_rows[0][s],
+                        'signal': macd_rows[1][s],
+                        'histogram': macd_rows[2][s]
+                    }
+                
+                if bands is not None:
+                    result['bollinger_bands'] = {
+                        'upper': bands[0][s],
+                        'middle': bands[1][s],
+                        'lower': bands[2][s]
+                    }
+                
+                if stochastic_values is not None:
+                    result['stochastic'] = {
+                        'k_percent': stochastic_values[0][s],
+                        'd_percent': stochastic_values[1][s]
+                    }
+                elif highs is not None and lows is not None and n:
+                    result['stochastic'] = {'k_percent': empty_list, 'd_percent': empty_list}
+                
+                results.append(result)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error calculating batch indicators: {str(e)}")
+            return [{} for _ in range(len(prices_matrix))]
+    
+    @staticmethod
+    def create_stateful(
+        config: Dict[str, Dict[str, Any]],
+        prices: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create incremental indicator states for a live price feed.
+        
+        Each state's update(price) advances it by one bar in O(1) instead of
+        recomputing the indicator over the whole history.
+        
+        Args:
+            config: Indicator ('ema', 'rsi', 'macd' or 'bollinger_bands') to
+                its parameters, e.g. {'rsi': {'period': 14}, 'macd': {}}
+            prices: Optional price history to warm the states up with
+            
+        Returns:
+            Dict of indicator name to its state
+        """
+        unknown = set(config) - set(STATE_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown indicators: {', '.join(sorted(unknown))}")
+        
+        states = {name: STATE_CLASSES[name](**params) for name, params in config.items()}
+        if prices is not None:
+            for state in states.values():
+                state.batch_init(prices)
+        return states
+    
+    @staticmethod
+    def _latest(values: Any) -> Optional[float]:
+        """Get the last present value of a list (None missing) or array (NaN missing)."""
+        # Missing values only pad the warm-up prefix, so the last entry is
+        # almost always the answer; scan back only if it is missing
+        # (value == value is False only for NaN)
+        if len(values):
+            last = values[-1]
+            if last is not None and last == last:
+                return float(last)
+        return next((float(value) for value in reversed(values) if value is not None and value == value), None)
+    
     @staticmethod
     def get_signal_summary(indicators: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -335,8 +656,8 @@ class TechnicalAnalysisService:
         
         try:
             # RSI signals
-            if 'rsi' in indicators and indicators['rsi']:
-                latest_rsi = next((rsi for rsi in reversed(indicators['rsi']) if rsi is not None), None)
+            if 'rsi' in indicators and len(indicators['rsi']):
+                latest_rsi = TechnicalAnalysisService._latest(indicators['rsi'])
                 if latest_rsi:
                     if latest_rsi > 70:
                         signals['rsi'] = 'Overbought'
@@ -346,12 +667,12 @@ class TechnicalAnalysisService:
                         signals['rsi'] = 'Neutral'
             
             # MACD signals
-            if 'macd' in indicators and indicators['macd'].get('macd') and indicators['macd'].get('signal'):
+            if 'macd' in indicators and len(indicators['macd'].get('macd', [])) and len(indicators['macd'].get('signal', [])):
                 macd_line = indicators['macd']['macd']
                 signal_line = indicators['macd']['signal']
                 
-                latest_macd = next((m for m in reversed(macd_line) if m is not None), None)
-                latest_signal = next((s for s in reversed(signal_line) if s is not None), None)
+                latest_macd = TechnicalAnalysisService._latest(macd_line)
+                latest_signal = TechnicalAnalysisService._latest(signal_line)
                 
                 if latest_macd and latest_signal:
                     if latest_macd > latest_signal:
@@ -364,9 +685,9 @@ class TechnicalAnalysisService:
                 sma_20 = indicators['sma'].get('sma_20', [])
                 sma_50 = indicators['sma'].get('sma_50', [])
                 
-                if sma_20 and sma_50:
-                    latest_sma_20 = next((sma for sma in reversed(sma_20) if sma is not None), None)
-                    latest_sma_50 = next((sma for sma in reversed(sma_50) if sma is not None), None)
+                if len(sma_20) and len(sma_50):
+                    latest_sma_20 = TechnicalAnalysisService._latest(sma_20)
+                    latest_sma_50 = TechnicalAnalysisService._latest(sma_50)
                     
                     if latest_sma_20 and latest_sma_50:
                         if latest_sma_20 > latest_sma_50:
@@ -1,10 +1,21 @@
 from typing import Any, Dict, Optional, Union
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
 
+# Process-wide cache of user column values by ID, for authenticating requests
+USER_CACHE_TTL = 60.0
+USER_CACHE_SIZE = 10000
+_user_cache: TTLCache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+
+def invalidate_cached_user(id: Any) -> None:
+    _user_cache.pop(str(id), None)
+
 
 class UserService:
     def __init__(self, db: AsyncSession):
@@ -14,6 +25,33 @@ class UserService:
         result = await self.db.execute(select(User).where(User.id == id))
         return result.scalar_one_or_none()
 
+    async def get_cached(self, id: Any) -> Optional[User]:
+        """
+        Get a user by ID, skipping the database for USER_CACHE_TTL after a load.
+
+        Only column values are cached. Each hit builds a fresh instance and
+        merges it into this session as already persistent, with no query,
+        so requests never share an ORM object; if the session already holds
+        the user, its instance is returned instead.
+        
+        update() and remove() invalidate the entry immediately. Changes made
+        any other way, is_active and is_superuser included (admin scripts,
+        direct SQL), can be served from the cache for up to USER_CACHE_TTL
+        seconds; call invalidate_cached_user() after them to apply them at once.
+        """
+        values = _user_cache.get(str(id))
+        if values is None:
+            user = await self.get(id=id)
+            if user is not None:
+                _user_cache[str(id)] = {
+                    column.key: getattr(user, column.key) for column in User.__table__.columns
+                }
+            return user
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await self.db.merge(user, load=False)
+
     async def get_by_email(self, *, email: str) -> Optional[User]:
         result = await self.db.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
@@ -48,6 +86,7 @@ class UserService:
         
         self.db.add(db_obj)
         await self.db.commit()
+        invalidate_cached_user(db_obj.id)
         await self.db.refresh(db_obj)
         return db_obj
 
@@ -55,6 +94,7 @@ class UserService:
         obj = await self.get(id=id)
         await self.db.delete(obj)
         await self.db.commit()
+        invalidate_cached_user(id)
         return obj
 
     async def authenticate(self, *, email: str, password: str) -> Optional[User]:
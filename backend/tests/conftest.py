@@ -0,0 +1,31 @@
+import pytest_asyncio
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base
+
+
+# The models use PostgreSQL column types; render them for in-memory SQLite
+@compiles(UUID, "sqlite")
+def _compile_uuid(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest_asyncio.fixture
+async def db():
+    """An AsyncSession on a fresh in-memory database with every table created."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
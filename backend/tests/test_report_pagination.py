@@ -0,0 +1,85 @@
+"""
+Keyset pagination of ReportManagerService.get_user_reports.
+"""
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+
+from app.models.analysis import AnalysisReport, RiskLevel
+from app.models.user import User
+from app.services.report_manager import ReportManagerService
+
+
+async def _add_user(db, email: str) -> User:
+    user = User(email=email, hashed_password="x", full_name="Test User")
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def _add_reports(db, user: User, created: list) -> list:
+    reports = [
+        AnalysisReport(
+            user_id=user.id,
+            stock_symbol="BHP",
+            parameters={},
+            results={"recommendation": "HOLD"},
+            risk_level=RiskLevel.MODERATE,
+            created_at=created_at,
+        )
+        for created_at in created
+    ]
+    db.add_all(reports)
+    await db.commit()
+    return reports
+
+
+async def _all_pages(manager: ReportManagerService, user_id: uuid.UUID, limit: int) -> list:
+    pages = []
+    cursor = None
+    while True:
+        reports, cursor = await manager.get_user_reports(user_id=user_id, cursor=cursor, limit=limit)
+        pages.append(reports)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 10])
+async def test_pages_cover_every_report_once_newest_first(db, limit):
+    user = await _add_user(db, "pager@example.com")
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    # Several reports share a timestamp, so the id has to break ties
+    created = [start + timedelta(hours=hour) for hour in (0, 1, 1, 1, 2, 3, 3, 4)]
+    reports = await _add_reports(db, user, created)
+
+    pages = await _all_pages(ReportManagerService(db), user.id, limit)
+    seen = [report.id for page in pages for report in page]
+
+    expected = sorted(reports, key=lambda r: (r.created_at, r.id), reverse=True)
+    assert seen == [report.id for report in expected]
+    assert all(len(page) <= limit for page in pages)
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+async def test_last_full_page_is_followed_by_an_empty_page(db):
+    user = await _add_user(db, "exact@example.com")
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    await _add_reports(db, user, [start + timedelta(days=day) for day in range(4)])
+
+    pages = await _all_pages(ReportManagerService(db), user.id, 2)
+    assert [len(page) for page in pages] == [2, 2, 0]
+
+
+async def test_pagination_only_returns_the_users_active_reports(db):
+    user = await _add_user(db, "owner@example.com")
+    other = await _add_user(db, "other@example.com")
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    mine = await _add_reports(db, user, [start + timedelta(days=day) for day in range(3)])
+    await _add_reports(db, other, [start + timedelta(days=day) for day in range(3)])
+    mine[1].is_active = False
+    await db.commit()
+
+    pages = await _all_pages(ReportManagerService(db), user.id, 1)
+    seen = {report.id for page in pages for report in page}
+    assert seen == {mine[0].id, mine[2].id}
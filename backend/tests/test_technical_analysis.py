@@ -0,0 +1,171 @@
+"""
+Parity of the indicator kernels with the pandas implementation they replaced.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.incremental import MACDState
+from app.services.technical_analysis import TechnicalAnalysisService as TA
+
+
+def _ema(series: pd.Series, span: int) -> np.ndarray:
+    return series.ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def pandas_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    delta = pd.Series(close).diff()
+    gains = delta.where(delta > 0, 0)
+    losses = -delta.where(delta < 0, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = _ema(gains, period) / _ema(losses, period)
+    return 100 - (100 / (1 + rs))
+
+
+def pandas_macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    series = pd.Series(close)
+    macd_line = _ema(series, fast) - _ema(series, slow)
+    signal_line = _ema(pd.Series(macd_line), signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def pandas_sma(close: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(close).rolling(window=period).mean().to_numpy()
+
+
+def pandas_bollinger(close: np.ndarray, period: int = 20, std_dev: float = 2.0):
+    rolling = pd.Series(close).rolling(window=period)
+    middle = rolling.mean().to_numpy()
+    std = rolling.std().to_numpy()
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+
+def pandas_stochastic(high, low, close, k_period: int = 14, d_period: int = 3):
+    lowest = pd.Series(low).rolling(window=k_period).min()
+    highest = pd.Series(high).rolling(window=k_period).max()
+    k_percent = 100 * (pd.Series(close) - lowest) / (highest - lowest)
+    return k_percent.to_numpy(), k_percent.rolling(window=d_period).mean().to_numpy()
+
+
+def assert_parity(actual: np.ndarray, expected: np.ndarray) -> None:
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.fixture
+def bars():
+    """A random walk of 300 daily bars with highs and lows around the close."""
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+    spread = np.abs(rng.normal(0, 1, 300))
+    return close, close + spread, close - spread
+
+
+def test_rsi_matches_pandas(bars):
+    close, _, _ = bars
+    assert_parity(TA.calculate_rsi(close, as_numpy=True), pandas_rsi(close))
+
+
+def test_macd_matches_pandas(bars):
+    close, _, _ = bars
+    result = TA.calculate_macd(close, as_numpy=True)
+    for key, expected in zip(('macd', 'signal', 'histogram'), pandas_macd(close)):
+        assert_parity(result[key], expected)
+
+
+def test_macd_from_cached_emas_matches_pandas(bars):
+    close, _, _ = bars
+    cache = {('ema', 12): _ema(pd.Series(close), 12), ('ema', 26): _ema(pd.Series(close), 26)}
+    result = TA.calculate_macd(close, cache=cache, as_numpy=True)
+    for key, expected in zip(('macd', 'signal', 'histogram'), pandas_macd(close)):
+        assert_parity(result[key], expected)
+
+
+def test_moving_averages_match_pandas(bars):
+    close, _, _ = bars
+    result = TA.calculate_moving_averages(close, as_numpy=True)
+    for period in (5, 10, 20, 50, 200):
+        assert_parity(result[f'sma_{period}'], pandas_sma(close, period))
+
+
+def test_exponential_moving_averages_match_pandas(bars):
+    close, _, _ = bars
+    result = TA.calculate_exponential_moving_averages(close, as_numpy=True)
+    for period in (12, 26, 50):
+        assert_parity(result[f'ema_{period}'], _ema(pd.Series(close), period))
+
+
+def test_bollinger_bands_match_pandas(bars):
+    close, _, _ = bars
+    result = TA.calculate_bollinger_bands(close, as_numpy=True)
+    for key, expected in zip(('upper', 'middle', 'lower'), pandas_bollinger(close)):
+        assert_parity(result[key], expected)
+
+
+def test_stochastic_matches_pandas(bars):
+    close, high, low = bars
+    result = TA.calculate_stochastic(high, low, close, as_numpy=True)
+    k_percent, d_percent = pandas_stochastic(high, low, close)
+    assert_parity(result['k_percent'], k_percent)
+    assert_parity(result['d_percent'], d_percent)
+
+
+def test_all_indicators_match_individual_calculations(bars):
+    close, high, low = bars
+    result = TA.calculate_all_indicators(close, list(high), list(low), as_numpy=True)
+
+    assert_parity(result['rsi'], pandas_rsi(close))
+    for key, expected in zip(('macd', 'signal', 'histogram'), pandas_macd(close)):
+        assert_parity(result['macd'][key], expected)
+    for period in (5, 10, 20, 50, 200):
+        assert_parity(result['sma'][f'sma_{period}'], pandas_sma(close, period))
+    for period in (12, 26, 50):
+        assert_parity(result['ema'][f'ema_{period}'], _ema(pd.Series(close), period))
+    for key, expected in zip(('upper', 'middle', 'lower'), pandas_bollinger(close)):
+        assert_parity(result['bollinger_bands'][key], expected)
+    for key, expected in zip(('k_percent', 'd_percent'), pandas_stochastic(high, low, close)):
+        assert_parity(result['stochastic'][key], expected)
+
+
+def test_short_series_leaves_long_indicators_empty():
+    result = TA.calculate_all_indicators(list(np.linspace(10, 12, 30)))
+    assert result['sma']['sma_50'] == [None] * 30
+    assert result['ema']['ema_50'] == [None] * 30
+    assert result['macd']['macd'][-1] is not None
+
+
+def test_batch_matches_all_indicators(bars):
+    close, high, low = bars
+    closes = np.vstack([close, close * 1.5, close[::-1].copy()])
+    highs = np.vstack([high, high * 1.5, high[::-1].copy()])
+    lows = np.vstack([low, low * 1.5, low[::-1].copy()])
+
+    results = TA.calculate_batch(closes, highs, lows)
+    assert len(results) == 3
+    for s, result in enumerate(results):
+        expected = TA.calculate_all_indicators(list(closes[s]), list(highs[s]), list(lows[s]))
+        assert result.keys() == expected.keys()
+        for key in expected:
+            assert result[key] == expected[key], key
+
+
+def test_batch_skips_symbols_with_non_finite_prices(bars):
+    close, _, _ = bars
+    broken = close.copy()
+    broken[10] = np.nan
+
+    results = TA.calculate_batch(np.vstack([close, broken]))
+    assert results[1] == {}
+    assert results[0]['sma'] == TA.calculate_all_indicators(list(close))['sma']
+
+
+def test_macd_state_matches_calculate_macd(bars):
+    close, _, _ = bars
+    state = MACDState()
+    state.batch_init(close[:200])
+    for price in close[200:]:
+        latest = state.update(price)
+
+    expected = TA.calculate_macd(close, as_numpy=True)
+    for key in ('macd', 'signal', 'histogram'):
+        assert latest[key] == pytest.approx(expected[key][-1], rel=1e-9)
@@ -0,0 +1,40 @@
+"""
+UserService.get_cached on sessions that do or do not already hold the user.
+"""
+from sqlalchemy import inspect
+
+from app.models.user import User
+from app.services.user_service import UserService, invalidate_cached_user
+
+
+async def _add_user(db) -> User:
+    user = User(email="cached@example.com", hashed_password="x", full_name="Cached User")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def test_cache_hit_returns_the_instance_the_session_already_holds(db):
+    user = await _add_user(db)
+    service = UserService(db)
+    try:
+        assert await service.get_cached(user.id) is user  # Miss: loads and caches
+        assert await service.get_cached(user.id) is user  # Hit: merged into the held identity
+    finally:
+        invalidate_cached_user(user.id)
+
+
+async def test_cache_hit_in_a_new_session_is_persistent_without_a_query(db):
+    user = await _add_user(db)
+    service = UserService(db)
+    try:
+        await service.get_cached(user.id)
+        db.expunge_all()
+
+        cached = await service.get_cached(user.id)
+        assert cached is not user
+        assert inspect(cached).persistent
+        assert (cached.id, cached.email, cached.is_active) == (user.id, user.email, user.is_active)
+        assert not db.dirty
+    finally:
+        invalidate_cached_user(user.id)
@@ -2,95 +2,314 @@
 Alpha Vantage API integration for ASX market data
 """
 import asyncio
+import heapq
+import weakref
+from functools import lru_cache
+from operator import itemgetter
 import httpx
-from typing import Dict, List, Optional, Any
+import numpy as np
+import orjson
+from aiolimiter import AsyncLimiter
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
+try:
+    import ijson
+    HAVE_IJSON = True
+except ImportError:
+    HAVE_IJSON = False
+
+from data_sources.cache import CacheBackend, FileCache, cached
+
 logger = logging.getLogger(__name__)
 
+# Every request goes to the same host, so keep connections alive and let
+# HTTP/2 multiplex concurrent requests over one of them
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+
+# How long responses stay cached, by endpoint
+QUOTE_CACHE_TTL = timedelta(seconds=60)
+OVERVIEW_CACHE_TTL = timedelta(days=30)
+HISTORICAL_CACHE_TTL = timedelta(days=1)
+INDICATOR_CACHE_TTL = timedelta(hours=1)
+
+# Most quote requests the market overview has in flight at once
+MAX_CONCURRENT_QUOTES = 10
+
+# Most symbols REALTIME_BULK_QUOTES accepts per request
+BULK_QUOTE_LIMIT = 100
+
+# Time series function for each historical data interval
+FUNCTION_MAP = {
+    "daily": "TIME_SERIES_DAILY",
+    "weekly": "TIME_SERIES_WEEKLY",
+    "monthly": "TIME_SERIES_MONTHLY"
+}
+
+# Requests allowed per period in seconds; pass e.g. (75, 60) for a paid plan
+FREE_TIER_RATE_LIMIT = (5, 60.0)
+
+# One HTTP client per event loop, shared by every AlphaVantageClient on it,
+# so its connection pool outlives individual clients and requests. Clients
+# only borrow it; close_session() closes it once on application shutdown
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_session() -> httpx.AsyncClient:
+    """Return the running event loop's shared HTTP client, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.is_closed:
+        session = httpx.AsyncClient(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        _sessions[loop] = session
+    return session
+
+
+async def close_session() -> None:
+    """Close the running event loop's shared HTTP client; call once on application shutdown"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.aclose()
+
+
+# One token bucket per API key, shared by all of its clients, since
+# Alpha Vantage limits requests per key
+_limiters: Dict[Tuple[str, int, float], AsyncLimiter] = {}
+
+
+def _get_limiter(api_key: str, rate_limit: Tuple[int, float]) -> AsyncLimiter:
+    """Return the rate limiter for an API key and rate"""
+    key = (api_key, *rate_limit)
+    if key not in _limiters:
+        _limiters[key] = AsyncLimiter(*rate_limit)
+    return _limiters[key]
+
+
+@lru_cache(maxsize=512)
+def _asx_symbol(symbol: str) -> str:
+    """Alpha Vantage symbol for an ASX stock (with the .AX suffix)"""
+    return f"{symbol}.AX"
+
+
+# Company overview fields parsed as numbers: output name, raw key
+OVERVIEW_NUMERIC_FIELDS = (
+    ("market_cap", "MarketCapitalization"),
+    ("pe_ratio", "PERatio"),
+    ("pb_ratio", "PriceToBookRatio"),
+    ("dividend_yield", "DividendYield"),
+    ("eps", "EPS"),
+    ("revenue_ttm", "RevenueTTM"),
+    ("profit_margin", "ProfitMargin"),
+    ("return_on_equity", "ReturnOnEquityTTM"),
+    ("debt_to_equity", "DebtToEquity"),
+    ("current_ratio", "CurrentRatio")
+)
+
+# How Alpha Vantage reports a missing numeric value
+MISSING_VALUES = frozenset((None, "", "None", "-"))
+
+
+def _parse_percent(value: str) -> float:
+    """Parse a percentage such as "1.25%" without building a stripped copy first"""
+    return float(value[:-1]) if value and value[-1] == "%" else float(value or 0)
+
+
+# Raw keys of a quote's price, change, change percent, volume, high, low,
+# open and previous close, by endpoint
+GLOBAL_QUOTE_FIELDS = (
+    "05. price", "09. change", "10. change percent", "06. volume",
+    "03. high", "04. low", "02. open", "08. previous close"
+)
+BULK_QUOTE_FIELDS = (
+    "close", "change", "change_percent", "volume",
+    "high", "low", "open", "previous_close"
+)
+
+
+def _parse_quote(raw: Dict[str, Any], symbol: str, fields: Tuple[str, ...], timestamp: str) -> Dict[str, Any]:
+    """Build a quote dict from a raw GLOBAL_QUOTE or bulk quote entry"""
+    price, change, change_percent, volume, high, low, open_, previous_close = fields
+    get = raw.get
+    return {
+        "symbol": symbol,
+        "price": float(get(price, 0)),
+        "change": float(get(change, 0)),
+        "change_percent": _parse_percent(str(get(change_percent, "0"))),
+        "volume": int(get(volume, 0)),
+        "high": float(get(high, 0)),
+        "low": float(get(low, 0)),
+        "open": float(get(open_, 0)),
+        "previous_close": float(get(previous_close, 0)),
+        "timestamp": timestamp
+    }
+
+
+class _AsyncByteReader:
+    """File-like view of an async byte iterator, as ijson's async parsers expect"""
+    def __init__(self, chunks):
+        self._chunks = chunks.__aiter__()
+    
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""  # ijson probes the return type with read(0)
+        
+        # An empty read means end of input, so skip empty chunks
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+async def _stream_columns(response: httpx.Response, time_series_key: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Parse a time series response into the columns of _get_historical_columns
+    while it downloads, one bar at a time
+    """
+    dates, opens, highs, lows, closes, volumes = [], [], [], [], [], []
+    bars = ijson.kvitems_async(_AsyncByteReader(response.aiter_bytes()), time_series_key)
+    async for date_str, bar in bars:
+        dates.append(date_str)
+        opens.append(bar["1. open"])
+        highs.append(bar["2. high"])
+        lows.append(bar["3. low"])
+        closes.append(bar["4. close"])
+        volumes.append(bar["5. volume"])
+    
+    if not dates:
+        return None
+    return {"date": dates, "open": opens, "high": highs, "low": lows, "close": closes, "volume": volumes}
+
 
 class AlphaVantageClient:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[CacheBackend] = None,
+        rate_limit: Tuple[int, float] = FREE_TIER_RATE_LIMIT,
+        bulk_quotes: bool = False
+    ):
         self.api_key = api_key
+        self._base_params = {"apikey": api_key}  # Shared by every request's params
         self.base_url = "https://www.alphavantage.co/query"
-        self.session = httpx.AsyncClient(timeout=30.0)
+        self.cache = cache if cache is not None else FileCache()
+        self.limiter = _get_limiter(api_key, rate_limit)
+        # REALTIME_BULK_QUOTES is premium-only; with a free key every call
+        # would spend a rate limit token for nothing
+        self.bulk_quotes = bulk_quotes
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.session.aclose()
+        # The shared session stays open for other clients; see close_session()
+        pass
+    
+    async def _get(self, params: Dict[str, Any]) -> httpx.Response:
+        """Send an API request once the rate limit allows it"""
+        await self.limiter.acquire()
+        response = await _get_session().get(self.base_url, params=params)
+        response.raise_for_status()
+        return response
     
-    async def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+    @cached(endpoint="quote", ttl=QUOTE_CACHE_TTL)
+    async def get_quote(self, symbol: str, _timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
-        Get real-time quote for ASX stock
+        Get real-time quote for ASX stock. Batch callers pass one _timestamp
+        for all their quotes instead of reading the clock for each.
         """
         try:
             params = {
                 "function": "GLOBAL_QUOTE",
-                "symbol": f"{symbol}.AX",  # ASX suffix
-                "apikey": self.api_key
+                "symbol": _asx_symbol(symbol),  # ASX suffix
+                **self._base_params
             }
             
-            response = await self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response = await self._get(params)
+            data = orjson.loads(response.content)
             
             if "Global Quote" in data:
-                quote = data["Global Quote"]
-                return {
-                    "symbol": symbol,
-                    "price": float(quote.get("05. price", 0)),
-                    "change": float(quote.get("09. change", 0)),
-                    "change_percent": float(quote.get("10. change percent", "0%").replace("%", "")),
-                    "volume": int(quote.get("06. volume", 0)),
-                    "high": float(quote.get("03. high", 0)),
-                    "low": float(quote.get("04. low", 0)),
-                    "open": float(quote.get("02. open", 0)),
-                    "previous_close": float(quote.get("08. previous close", 0)),
-                    "timestamp": datetime.now().isoformat()
-                }
+                return _parse_quote(
+                    data["Global Quote"], symbol, GLOBAL_QUOTE_FIELDS, _timestamp or datetime.now().isoformat()
+                )
             return None
             
         except Exception as e:
             logger.error(f"Error fetching quote for {symbol}: {e}")
             return None
     
-    async def get_company_overview(self, symbol: str) -> Optional[Dict[str, Any]]:
+    @cached(endpoint="bulk_quote", ttl=QUOTE_CACHE_TTL)
+    async def get_bulk_quotes(
+        self,
+        symbols: List[str],
+        _timestamp: Optional[str] = None
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
         """
-        Get company overview and fundamental data
+        Get real-time quotes for many ASX stocks, up to BULK_QUOTE_LIMIT per
+        request, keyed by symbol. Symbols the API does not return are
+        missing. Returns None if any request fails, so a partial answer is
+        never cached as a complete one.
+        
+        REALTIME_BULK_QUOTES needs a premium key: only call this on clients
+        created with bulk_quotes=True.
+        """
+        timestamp = _timestamp or datetime.now().isoformat()
+        quotes = {}
+        for start in range(0, len(symbols), BULK_QUOTE_LIMIT):
+            batch = symbols[start:start + BULK_QUOTE_LIMIT]
+            try:
+                params = {
+                    "function": "REALTIME_BULK_QUOTES",
+                    "symbol": ",".join(map(_asx_symbol, batch)),
+                    **self._base_params
+                }
+                
+                response = await self._get(params)
+                data = orjson.loads(response.content)
+                if "data" not in data:
+                    # Premium-only or rate limited: the reason is in the body
+                    logger.warning(f"Bulk quotes unavailable: {data.get('Information') or data.get('Note') or data}")
+                    return None
+                
+                for quote in data["data"] or []:
+                    symbol = quote.get("symbol", "").removesuffix(".AX")
+                    quotes[symbol] = _parse_quote(quote, symbol, BULK_QUOTE_FIELDS, timestamp)
+                
+            except Exception as e:
+                logger.error(f"Error fetching bulk quotes for {', '.join(batch)}: {e}")
+                return None
+        
+        return quotes
+    
+    @cached(endpoint="overview", ttl=OVERVIEW_CACHE_TTL, serve_stale=True)
+    async def get_company_overview(self, symbol: str, _timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get company overview and fundamental data. Batch callers pass one
+        _timestamp for all their overviews instead of reading the clock
+        for each.
         """
         try:
             params = {
                 "function": "OVERVIEW",
-                "symbol": f"{symbol}.AX",
-                "apikey": self.api_key
+                "symbol": _asx_symbol(symbol),
+                **self._base_params
             }
             
-            response = await self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response = await self._get(params)
+            data = orjson.loads(response.content)
             
             if "Symbol" in data:
+                parse_numeric = self._parse_numeric
                 return {
                     "symbol": symbol,
                     "name": data.get("Name", ""),
                     "sector": data.get("Sector", ""),
                     "industry": data.get("Industry", ""),
-                    "market_cap": self._parse_numeric(data.get("MarketCapitalization")),
-                    "pe_ratio": self._parse_numeric(data.get("PERatio")),
-                    "pb_ratio": self._parse_numeric(data.get("PriceToBookRatio")),
-                    "dividend_yield": self._parse_numeric(data.get("DividendYield")),
-                    "eps": self._parse_numeric(data.get("EPS")),
-                    "revenue_ttm": self._parse_numeric(data.get("RevenueTTM")),
-                    "profit_margin": self._parse_numeric(data.get("ProfitMargin")),
-                    "return_on_equity": self._parse_numeric(data.get("ReturnOnEquityTTM")),
-                    "debt_to_equity": self._parse_numeric(data.get("DebtToEquity")),
-                    "current_ratio": self._parse_numeric(data.get("CurrentRatio")),
+                    **{name: parse_numeric(data.get(key)) for name, key in OVERVIEW_NUMERIC_FIELDS},
                     "description": data.get("Description", ""),
                     "website": data.get("Website", ""),
-                    "last_updated": datetime.now().isoformat()
+                    "last_updated": _timestamp or datetime.now().isoformat()
                 }
             return None
             
@@ -98,57 +317,127 @@ class AlphaVantageClient:
             logger.error(f"Error fetching company overview for {symbol}: {e}")
             return None
     
-    async def get_historical_data(
-        self, 
-        symbol: str, 
-        interval: str = "daily",
-        outputsize: str = "compact"
-    ) -> Optional[List[Dict[str, Any]]]:
+    @cached(endpoint="historical", ttl=HISTORICAL_CACHE_TTL)
+    async def _get_historical_columns(
+        self,
+        symbol: str,
+        interval: str,
+        outputsize: str
+    ) -> Optional[Dict[str, List[str]]]:
         """
-        Get historical price data
+        Fetch a time series as parallel columns of the API's raw strings,
+        in the API's (newest first) order
         """
         try:
-            function_map = {
-                "daily": "TIME_SERIES_DAILY",
-                "weekly": "TIME_SERIES_WEEKLY",
-                "monthly": "TIME_SERIES_MONTHLY"
-            }
-            
             params = {
-                "function": function_map.get(interval, "TIME_SERIES_DAILY"),
-                "symbol": f"{symbol}.AX",
+                "function": FUNCTION_MAP.get(interval, "TIME_SERIES_DAILY"),
+                "symbol": _asx_symbol(symbol),
                 "outputsize": outputsize,
-                "apikey": self.api_key
+                **self._base_params
             }
+            time_series_key = f"Time Series ({interval.title()})"
             
-            response = await self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            # Full histories are parsed as they stream in, so the whole body
+            # and its parsed tree are never held at once
+            if outputsize == "full" and HAVE_IJSON:
+                await self.limiter.acquire()
+                async with _get_session().stream("GET", self.base_url, params=params) as response:
+                    response.raise_for_status()
+                    return await _stream_columns(response, time_series_key)
+            
+            response = await self._get(params)
+            data = orjson.loads(response.content)
             
-            time_series_key = f"Time Series ({interval.title()})"
             if time_series_key in data:
-                historical_data = []
-                for date_str, values in data[time_series_key].items():
-                    historical_data.append({
-                        "symbol": symbol,
-                        "date": date_str,
-                        "open": float(values.get("1. open", 0)),
-                        "high": float(values.get("2. high", 0)),
-                        "low": float(values.get("3. low", 0)),
-                        "close": float(values.get("4. close", 0)),
-                        "volume": int(values.get("5. volume", 0)),
-                        "adjusted_close": float(values.get("4. close", 0))  # Alpha Vantage doesn't provide adjusted close
-                    })
-                
-                # Sort by date
-                historical_data.sort(key=lambda x: x["date"])
-                return historical_data
+                # Every bar carries all five fields; a malformed bar fails the
+                # whole request rather than being read as zeros
+                time_series = data[time_series_key]
+                bars = list(time_series.values())
+                return {
+                    "date": list(time_series),
+                    "open": [bar["1. open"] for bar in bars],
+                    "high": [bar["2. high"] for bar in bars],
+                    "low": [bar["3. low"] for bar in bars],
+                    "close": [bar["4. close"] for bar in bars],
+                    "volume": [bar["5. volume"] for bar in bars]
+                }
             return None
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return None
     
+    async def get_historical_data(
+        self, 
+        symbol: str, 
+        interval: str = "daily",
+        outputsize: str = "compact",
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get historical price data as columns, oldest bar first: 'date'
+        (datetime64[D]), 'open', 'high', 'low', 'close', 'adjusted_close'
+        (float64) and 'volume' (int64) arrays, plus the 'symbol'.
+        Use as_records() for a list of per-bar dicts.
+        """
+        columns = await self._get_historical_columns(symbol, interval, outputsize, force_refresh=force_refresh)
+        if columns is None:
+            return None
+        
+        try:
+            # NumPy parses the numeric strings itself; one argsort orders
+            # every column
+            dates = np.array(columns["date"], dtype="datetime64[D]")
+            order = np.argsort(dates, kind="stable")
+            close = np.array(columns["close"], dtype=np.float64)[order]
+            return {
+                "symbol": symbol,
+                "date": dates[order],
+                "open": np.array(columns["open"], dtype=np.float64)[order],
+                "high": np.array(columns["high"], dtype=np.float64)[order],
+                "low": np.array(columns["low"], dtype=np.float64)[order],
+                "close": close,
+                "volume": np.array(columns["volume"], dtype=np.int64)[order],
+                "adjusted_close": close  # Alpha Vantage doesn't provide adjusted close
+            }
+            
+        except Exception as e:
+            logger.error(f"Error parsing historical data for {symbol}: {e}")
+            return None
+    
+    async def get_latest_historical(
+        self,
+        symbol: str,
+        interval: str = "daily",
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent bar, in the as_records() shape, without building
+        the whole series
+        """
+        columns = await self._get_historical_columns(symbol, interval, "compact", force_refresh=force_refresh)
+        if not columns or not columns["date"]:
+            return None
+        
+        try:
+            dates = columns["date"]
+            i = 0 if dates[0] >= dates[-1] else -1  # Newest first, as the API sends it
+            return {
+                "symbol": symbol,
+                "date": dates[i],
+                "open": float(columns["open"][i]),
+                "high": float(columns["high"][i]),
+                "low": float(columns["low"][i]),
+                "close": float(columns["close"][i]),
+                "volume": int(columns["volume"][i]),
+                "adjusted_close": float(columns["close"][i])  # Alpha Vantage doesn't provide adjusted close
+            }
+            
+        except Exception as e:
+            logger.error(f"Error parsing latest historical data for {symbol}: {e}")
+            return None
+    
+    @cached(endpoint="indicator", ttl=INDICATOR_CACHE_TTL)
     async def get_technical_indicators(
         self, 
         symbol: str, 
@@ -162,16 +451,15 @@ class AlphaVantageClient:
         try:
             params = {
                 "function": function,
-                "symbol": f"{symbol}.AX",
+                "symbol": _asx_symbol(symbol),
                 "interval": interval,
                 "time_period": time_period,
                 "series_type": "close",
-                "apikey": self.api_key
+                **self._base_params
             }
             
-            response = await self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response = await self._get(params)
+            data = orjson.loads(response.content)
             
             # Parse technical indicator data
             meta_key = f"Meta Data"
@@ -180,8 +468,11 @@ class AlphaVantageClient:
                 indicator_key = f"Technical Analysis: {function}"
                 
                 if indicator_key in data:
-                    latest_date = max(data[indicator_key].keys())
-                    latest_value = data[indicator_key][latest_date]
+                    # Dates are sorted (newest first), so the latest is at
+                    # one end; checking both avoids scanning every date
+                    series = data[indicator_key]
+                    latest_date = max(next(iter(series)), next(reversed(series)))
+                    latest_value = series[latest_date]
                     
                     return {
                         "symbol": symbol,
@@ -199,57 +490,111 @@ class AlphaVantageClient:
     
     def _parse_numeric(self, value: str) -> Optional[float]:
         """Parse numeric string values from API"""
-        if not value or value == "None":
-            return None
         try:
+            # Missing values are caught by one set lookup rather than by
+            # float() raising
+            if value in MISSING_VALUES:
+                return None
             return float(value)
         except (ValueError, TypeError):
             return None
 
 
+def as_records(history: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert get_historical_data() columns to one dict per bar, oldest first"""
+    symbol = history["symbol"]
+    return [
+        {
+            "symbol": symbol,
+            "date": date_str,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "adjusted_close": adjusted_close
+        }
+        for date_str, open_, high, low, close, volume, adjusted_close in zip(
+            np.datetime_as_string(history["date"]).tolist(),
+            history["open"].tolist(),
+            history["high"].tolist(),
+            history["low"].tolist(),
+            history["close"].tolist(),
+            history["volume"].tolist(),
+            history["adjusted_close"].tolist()
+        )
+    ]
+
+
+# Common ASX 200 stocks - in production, this would be from a database or API
+ASX_200: Tuple[str, ...] = (
+    "CBA", "BHP", "WBC", "ANZ", "NAB", "CSL", "WES", "TLS", "RIO", "FMG",
+    "WOW", "TCL", "STO", "QBE", "SUN", "AMC", "WPL", "BXB", "SCG", "IAG",
+    "GMG", "ALL", "S32", "ORG", "JHX", "DOW", "RHC", "ASX", "TWE", "NCM"
+)
+
+
 # ASX-specific helper functions
 class ASXDataProvider:
-    def __init__(self, api_key: str):
-        self.client = AlphaVantageClient(api_key)
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[CacheBackend] = None,
+        rate_limit: Tuple[int, float] = FREE_TIER_RATE_LIMIT,
+        bulk_quotes: bool = False
+    ):
+        self.client = AlphaVantageClient(api_key, cache, rate_limit, bulk_quotes)
     
-    async def get_asx_200_stocks(self) -> List[str]:
+    def get_asx_200_stocks(self) -> Tuple[str, ...]:
         """
         Get list of ASX 200 stock symbols
         Note: This would typically come from a static list or another data source
         """
-        # Common ASX 200 stocks - in production, this would be from a database or API
-        return [
-            "CBA", "BHP", "WBC", "ANZ", "NAB", "CSL", "WES", "TLS", "RIO", "FMG",
-            "WOW", "TCL", "STO", "QBE", "SUN", "AMC", "WPL", "BXB", "SCG", "IAG",
-            "GMG", "ALL", "S32", "ORG", "JHX", "DOW", "RHC", "ASX", "TWE", "NCM"
-        ]
+        return ASX_200
     
     async def get_market_overview(self) -> Dict[str, Any]:
         """
         Get ASX market overview
         """
         async with self.client as client:
-            # Get ASX 200 index data
-            asx_200_data = await client.get_quote("XJO")  # ASX 200 index
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUOTES)
+            timestamp = datetime.now().isoformat()  # Shared by every quote in the overview
+            
+            async def get_quote(symbol: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await client.get_quote(symbol, _timestamp=timestamp)
             
             # Get top movers (simplified - would need more sophisticated logic)
-            top_stocks = await self.get_asx_200_stocks()
-            stock_quotes = []
+            symbols = ["XJO", *ASX_200[:20]]  # ASX 200 index, then first 20 stocks for performance
+            
+            # With a premium key, fetch everything in one bulk request; then
+            # any symbols not covered one by one, concurrently
+            quotes_map = {}
+            if client.bulk_quotes:
+                quotes_map.update(await client.get_bulk_quotes(symbols, _timestamp=timestamp) or {})
+            missing = [symbol for symbol in symbols if symbol not in quotes_map]
+            if missing:
+                quotes = await asyncio.gather(*[get_quote(symbol) for symbol in missing], return_exceptions=True)
+                quotes_map.update(
+                    (symbol, quote) for symbol, quote in zip(missing, quotes) if isinstance(quote, dict)
+                )
+            
+            # Cached quotes carry the time they were first fetched; stamp
+            # copies with the overview's time so the snapshot is consistent
+            quotes_map = {symbol: {**quote, "timestamp": timestamp} for symbol, quote in quotes_map.items()}
             
-            for symbol in top_stocks[:20]:  # Limit to first 20 for performance
-                quote = await client.get_quote(symbol)
-                if quote:
-                    stock_quotes.append(quote)
+            asx_200_data = quotes_map.get("XJO")
+            stock_quotes = [quotes_map[symbol] for symbol in symbols[1:] if symbol in quotes_map]
             
-            # Sort by change percentage
-            top_gainers = sorted(stock_quotes, key=lambda x: x["change_percent"], reverse=True)[:5]
-            top_losers = sorted(stock_quotes, key=lambda x: x["change_percent"])[:5]
-            most_active = sorted(stock_quotes, key=lambda x: x["volume"], reverse=True)[:5]
+            # Select the top 5 by change percentage and volume
+            top_gainers = heapq.nlargest(5, stock_quotes, key=itemgetter("change_percent"))
+            top_losers = heapq.nsmallest(5, stock_quotes, key=itemgetter("change_percent"))
+            most_active = heapq.nlargest(5, stock_quotes, key=itemgetter("volume"))
             
             return {
                 "asx_200": asx_200_data or {"value": 0, "change": 0, "change_percent": 0},
                 "top_gainers": top_gainers,
                 "top_losers": top_losers,
                 "most_active": most_active,
-                "last_updated": datetime.now().isoformat()
+                "last_updated": timestamp
             }
@@ -0,0 +1,223 @@
+"""
+Response caches for market data API clients
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+import logging
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default_cache_dir() -> Path:
+    """
+    ALPHA_VANTAGE_CACHE_DIR if set, otherwise a directory under the user's
+    cache directory ($XDG_CACHE_HOME or ~/.cache), so cached responses never
+    land in whatever working tree the client happens to be run from.
+    """
+    configured = os.getenv("ALPHA_VANTAGE_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "mugpunters" / "alpha_vantage"
+
+
+DEFAULT_CACHE_DIR = _default_cache_dir()
+
+
+def make_key(params: Dict[str, Any]) -> str:
+    """Stable digest of a call's parameters."""
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return hashlib.md5(encoded).hexdigest()
+
+
+def _expired(cached_at: float, ttl: Optional[timedelta]) -> bool:
+    """Whether an entry is older than ttl; None accepts any age."""
+    return ttl is not None and time.time() - cached_at > ttl.total_seconds()
+
+
+class MemoryCache:
+    """
+    In-process cache, mainly for tests and short-lived scripts.
+
+    Like every backend, get() with ttl=None returns the last value stored
+    however old it is, for serving stale data when the API fails.
+    """
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+    async def get(self, endpoint: str, key: str, ttl: Optional[timedelta]) -> Optional[Any]:
+        entry = self._entries.get((endpoint, key))
+        if entry is None or _expired(entry[0], ttl):
+            return None
+        return entry[1]
+
+    async def set(self, endpoint: str, key: str, value: Any, ttl: timedelta) -> None:
+        self._entries[(endpoint, key)] = (time.time(), value)
+
+
+class FileCache:
+    """
+    JSON files under {directory}/{endpoint}/{key}.json, each holding the
+    value and the time it was cached. Survives restarts, so cached
+    responses do not count against the API's daily call limit again.
+    """
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, endpoint: str, key: str) -> Path:
+        return self.directory / endpoint / f"{key}.json"
+
+    def _read(self, path: Path, ttl: Optional[timedelta]) -> Optional[Any]:
+        try:
+            with open(path, "rb") as f:
+                entry = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+
+        if _expired(entry.get("_cached_at", 0), ttl):
+            return None
+        return entry.get("value")
+
+    def _write(self, path: Path, value: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps({"_cached_at": time.time(), "value": value}))
+        os.replace(tmp_path, path)  # Readers never see a partial file
+
+    async def get(self, endpoint: str, key: str, ttl: Optional[timedelta]) -> Optional[Any]:
+        return await asyncio.to_thread(self._read, self._path(endpoint, key), ttl)
+
+    async def set(self, endpoint: str, key: str, value: Any, ttl: timedelta) -> None:
+        try:
+            await asyncio.to_thread(self._write, self._path(endpoint, key), value)
+        except OSError as e:
+            logger.warning(f"Could not write {endpoint} cache entry: {e}")
+
+
+class RedisCache:
+    """
+    Redis cache shared by every worker process. Entries expire in Redis
+    after their TTL; a copy without expiry under a last_good: key backs
+    get() with ttl=None. Redis errors are logged and treated as misses.
+
+    Configure the server with maxmemory-policy allkeys-lfu so the
+    frequently requested symbols are the ones kept under memory pressure.
+    """
+    def __init__(self, url: str, prefix: str = "av"):
+        if aioredis is None:
+            raise ImportError("RedisCache requires the redis package")
+        self.client = aioredis.Redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, endpoint: str, key: str, ttl: Optional[timedelta]) -> Optional[Any]:
+        name = f"{self.prefix}:{endpoint}:{key}" if ttl is not None else f"{self.prefix}:last_good:{endpoint}:{key}"
+        try:
+            raw = await self.client.get(name)
+        except aioredis.RedisError as e:
+            logger.warning(f"Redis cache read failed: {e}")
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, endpoint: str, key: str, value: Any, ttl: timedelta) -> None:
+        raw = orjson.dumps(value)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.setex(f"{self.prefix}:{endpoint}:{key}", ttl, raw)
+                pipe.set(f"{self.prefix}:last_good:{endpoint}:{key}", raw)
+                await pipe.execute()
+        except aioredis.RedisError as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+
+CacheBackend = Union[MemoryCache, FileCache, RedisCache]
+
+
+# Calls still waiting on the API, by endpoint, key, API key and cache
+# instance, so concurrent misses for the same call on equivalent clients
+# share one request
+_inflight: Dict[Tuple[str, str, Optional[str], int], "asyncio.Task"] = {}
+
+
+def cached(endpoint: str, ttl: timedelta, serve_stale: bool = False) -> Callable:
+    """
+    Cache an async client method's results in the client's cache. None
+    and empty results (failed requests, or an API answering with nothing)
+    are never cached, so the next call asks again.
+
+    The key covers every argument, defaults included, except those named
+    with a leading underscore, which must not change the result. Pass
+    force_refresh=True to skip the lookup and replace the cached value.
+    With serve_stale, a call that returns nothing (the API failed or is
+    rate limiting) falls back to the last cached value, however old.
+
+    Calls with the same key made while one is already waiting on the API
+    await that call's result instead of making their own request, provided
+    they come from a client with the same API key and cache. The shared
+    request goes out on the event loop's shared HTTP session, which no
+    client closes, so a caller that is cancelled or leaves its async with
+    block does not fail it for the others.
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        async def load(self, key: str, args: tuple, kwargs: dict) -> Any:
+            value = await method(self, *args, **kwargs)
+            if self.cache is None:
+                return value
+
+            if value:
+                await self.cache.set(endpoint, key, value, ttl)
+            elif serve_stale:
+                stale = await self.cache.get(endpoint, key, None)
+                if stale is not None:
+                    logger.warning(f"Serving stale {endpoint} data after a failed request")
+                    value = stale
+            return value
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, force_refresh: bool = False, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = make_key({
+                name: value for name, value in bound.arguments.items()
+                if name != "self" and not name.startswith("_")
+            })
+
+            if self.cache is not None and not force_refresh:
+                value = await self.cache.get(endpoint, key, ttl)
+                if value is not None:
+                    return value
+
+            # The cache instance stays alive while its flight is pending, so
+            # its id cannot be reused by another cache in the meantime
+            flight = (endpoint, key, getattr(self, "api_key", None), id(self.cache))
+            task = _inflight.get(flight)
+            if task is None:
+                task = asyncio.ensure_future(load(self, key, args, kwargs))
+                _inflight[flight] = task
+                task.add_done_callback(lambda _: _inflight.pop(flight, None))
+
+            # Shielded so one caller being cancelled does not cancel the
+            # request for the others
+            return await asyncio.shield(task)
+
+        return wrapper
+    return decorator
@@ -21,6 +21,10 @@ CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 --     stock_symbol VARCHAR(10) NOT NULL,
 --     parameters JSONB NOT NULL,
 --     results JSONB NOT NULL,
+--     recommendation VARCHAR(20),
+--     confidence DOUBLE PRECISION,
+--     predicted_return DOUBLE PRECISION,
+--     target_price DOUBLE PRECISION,
 --     risk_level VARCHAR(20) NOT NULL CHECK (risk_level IN ('conservative', 'moderate', 'aggressive')),
 --     timeframe VARCHAR(20) NOT NULL DEFAULT '1y',
 --     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -51,6 +55,11 @@ CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 -- CREATE INDEX idx_analysis_reports_created_at ON analysis_reports(created_at);
 -- CREATE INDEX idx_analysis_reports_risk_level ON analysis_reports(risk_level);
 -- CREATE INDEX idx_analysis_reports_timeframe ON analysis_reports(timeframe);
+-- CREATE INDEX ix_analysis_reports_user_active_created ON analysis_reports(user_id, is_active, created_at DESC, id DESC);
+-- CREATE INDEX ix_analysis_reports_user_recommendation ON analysis_reports(user_id, recommendation);
+
+-- Databases created before the headline result columns existed are
+-- upgraded and backfilled by the alembic migration (backend/alembic)
 
 -- CREATE INDEX idx_report_performance_report_id ON report_performance(report_id);
 -- CREATE INDEX idx_report_performance_stock_symbol ON report_performance(stock_symbol);
@@ -36,7 +36,7 @@ class ReportApiService {
    * Get user's analysis reports with optional filtering
    */
   async getReports(params: {
-    skip?: number;
+    cursor?: string;
     limit?: number;
     risk_level?: 'conservative' | 'moderate' | 'aggressive';
     timeframe?: string;
@@ -44,7 +44,7 @@ class ReportApiService {
   } = {}): Promise<ReportListResponse> {
     const searchParams = new URLSearchParams();
     
-    if (params.skip !== undefined) searchParams.append('skip', params.skip.toString());
+    if (params.cursor) searchParams.append('cursor', params.cursor);
     if (params.limit !== undefined) searchParams.append('limit', params.limit.toString());
     if (params.risk_level) searchParams.append('risk_level', params.risk_level);
     if (params.timeframe) searchParams.append('timeframe', params.timeframe);
@@ -333,6 +333,6 @@ export interface PerformanceSummary {
 export interface ReportListResponse {
   reports: AnalysisReport[];
   total: number;
-  skip: number;
+  next_cursor: string | null;
   limit: number;
 }
\ No newline at end of file